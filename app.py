@@ -3,46 +3,233 @@ Pokemon Ultra Sun Search Application
 A simple Streamlit UI for searching and filtering Pokemon from Ultra Sun.
 """
 
+import math
+from collections import deque
+
+import numpy as np
 import streamlit as st
-import pandas as pd
-from pokemon_data import get_pokemon_data as load_pokemon_data
+from pokemon_data import (
+    DISPLAY_COLUMNS,
+    SORT_COLUMNS,
+    STAT_COLUMNS,
+    PokemonDataStore,
+    PokemonQuery,
+)
+from instrumentation import current_profiler, record_cache_miss, start_rerun
+from type_matchups import TypeMatchups
 
 
-@st.cache_data
-def get_pokemon_data():
-    """Load Pokemon data with caching."""
-    return load_pokemon_data()
+PAGE_SIZES = [25, 50, 100, 250]
+PROFILE_HISTORY = 10
 
 
-def main():
-    st.set_page_config(
-        page_title="Pokemon Ultra Sun Search",
-        page_icon="⚡",
-        layout="wide"
+@st.cache_resource
+def get_data_store():
+    """
+    Create the data store once and share it across sessions.
+    
+    The store hands out the index for the current data version, applying
+    new delta files as they appear, so data changes need no restart.
+    """
+    record_cache_miss('get_data_store')
+    return PokemonDataStore()
+
+
+@st.cache_resource(max_entries=2)
+def get_type_matchups(version, _index):
+    """Build the type matchup matrices once per data version."""
+    record_cache_miss('get_type_matchups')
+    return TypeMatchups(_index.df)
+
+
+def render_search_results(index, query, rows):
+    """Render one page of the filtered table, summary metrics and top 5."""
+    profiler = current_profiler()
+    with profiler.span('summarize'):
+        summary = index.summarize(query)
+    
+    # Display summary
+    st.subheader(f"Showing {summary['count']} Pokemon")
+    
+    # Display data
+    if summary['count'] > 0:
+        # Pagination controls; only the visible page is materialized
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page_size = st.selectbox("Rows per page", options=PAGE_SIZES, index=1)
+        pages = math.ceil(summary['count'] / page_size)
+        if st.session_state.get('results_page', 1) > pages:
+            st.session_state['results_page'] = pages
+        with col2:
+            page = st.number_input(
+                f"Page (of {pages})",
+                min_value=1,
+                max_value=pages,
+                step=1,
+                key='results_page'
+            )
+        start = (page - 1) * page_size
+        page_rows = rows[start:start + page_size]
+        
+        # Display as a table
+        with profiler.span('format_page'):
+            page_frame = index.display_frame(page_rows)
+        st.dataframe(
+            page_frame,
+            use_container_width=True,
+            height=min(600, 38 + 35 * len(page_rows)),
+            hide_index=True
+        )
+        st.caption(f"Rows {start + 1}-{start + len(page_rows)} of {summary['count']}")
+        
+        # Show statistics
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric("Total Pokemon", summary['count'])
+        
+        with col2:
+            st.metric("Avg Total Stats", f"{summary['mean']:.1f}")
+        
+        with col3:
+            st.metric("Highest Stats", summary['max'])
+        
+        with col4:
+            st.metric("Lowest Stats", summary['min'])
+        
+        # Top 5 by stats
+        if summary['count'] >= 5:
+            st.subheader("Top 5 by Total Stats")
+            top5 = index.display_frame(
+                index.top(rows, 5),
+                columns=['name', 'type1', 'type2', 'total_stats']
+            )
+            st.table(top5)
+    else:
+        st.warning("No Pokemon match the selected filters.")
+
+
+def render_team_builder(index, matchups, rows):
+    """Render the team matchup report and next-member suggestions."""
+    names = index.df['name'].to_numpy()
+    team = st.multiselect(
+        "Team (up to 6)",
+        options=range(index.size),
+        default=[],
+        format_func=lambda species_id: names[species_id],
+        max_selections=6
     )
     
-    st.title("⚡ Pokemon Ultra Sun Search")
-    st.markdown("Search and filter Pokemon from Pokemon Ultra Sun")
+    if not team:
+        st.info("Pick team members to see their weaknesses, resistances and coverage.")
+        return
     
-    # Load data
-    with st.spinner("Loading Pokemon data..."):
-        df = get_pokemon_data()
+    report = matchups.team_report(team)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        exposed = report.loc[report['exposed'], 'type'].tolist()
+        st.metric("Exposed Types", len(exposed))
+        st.caption(", ".join(exposed) or "None")
+    with col2:
+        gaps = report.loc[~report['covered'], 'type'].tolist()
+        st.metric("Coverage Gaps", len(gaps))
+        st.caption(", ".join(gaps) or "None")
+    
+    st.subheader("Defensive Matchups")
+    st.caption(
+        "Members weak to, resisting and immune to each attacking type; "
+        "Covered means a member's STAB hits that type super-effectively."
+    )
+    st.dataframe(
+        report.rename(columns={
+            'type': 'Type', 'weak': 'Weak', 'resist': 'Resist', 'immune': 'Immune',
+            'exposed': 'Exposed', 'covered': 'Covered'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    if len(team) < 6:
+        st.subheader("Suggested Next Members")
+        use_filters = st.checkbox("Only suggest Pokemon matching the sidebar filters", value=False)
+        candidates = None
+        if use_filters:
+            candidates = np.zeros(index.size, dtype=bool)
+            candidates[rows] = True
+        ranking = matchups.rank_candidates(team, candidates).head(10)
+        suggestions = index.display_frame(
+            ranking['species_id'].to_numpy(),
+            columns=['name', 'type1', 'type2', 'total_stats']
+        )
+        suggestions.insert(1, 'Coverage Gaps', ranking['coverage_gaps'].to_numpy())
+        suggestions.insert(2, 'Exposed Types', ranking['exposed_types'].to_numpy())
+        st.dataframe(suggestions, use_container_width=True, hide_index=True)
+
+
+def render_similar(index):
+    """Render the nearest neighbours of one Pokemon by stat profile."""
+    names = index.df['name'].to_numpy()
+    species_id = st.selectbox(
+        "Pokemon",
+        options=range(index.size),
+        format_func=lambda species_id: names[species_id]
+    )
     
+    col1, col2 = st.columns(2)
+    with col1:
+        k = st.slider("Number of results", min_value=1, max_value=20, value=10)
+    with col2:
+        restrict_types = st.multiselect(
+            "Restrict to Types",
+            options=index.types,
+            default=[]
+        )
+    
+    mask = index.mask(types=restrict_types) if restrict_types else None
+    neighbors, distances = index.similarity.similar(species_id, k, mask)
+    if len(neighbors) == 0:
+        st.warning("No Pokemon match the selected types.")
+        return
+    
+    similar = index.display_frame(neighbors)
+    similar.insert(1, 'Distance', distances.astype(np.float64).round(2))
+    st.caption("Distance between base stats, each scaled to zero mean and unit variance.")
+    st.dataframe(similar, use_container_width=True, hide_index=True)
+
+
+def render_sidebar(index):
+    """Render the sidebar filters and return the selected query."""
     # Sidebar filters
     st.sidebar.header("Filters")
     
-    # Type filter
-    all_types = set()
-    for _, row in df.iterrows():
-        if pd.notna(row['type1']):
-            all_types.add(row['type1'])
-        if pd.notna(row['type2']):
-            all_types.add(row['type2'])
+    # Name search
+    name_query = st.sidebar.text_input(
+        "Search by Name",
+        value="",
+        placeholder="e.g. pika, charzard"
+    )
     
+    # Type filter
     type_filter = st.sidebar.multiselect(
         "Filter by Type",
-        options=sorted(all_types),
-        default=[]
+        options=index.types,
+        default=[],
+        format_func=lambda type_name: f"{type_name} ({index.type_counts[type_name]})"
+    )
+    
+    # Evolution family filters
+    whole_family = st.sidebar.checkbox(
+        "Show Whole Evolution Family",
+        value=False,
+        help="Include every member of the evolution family of each matching Pokemon"
+    )
+    
+    stage_filter = st.sidebar.selectbox(
+        "Evolution Stage",
+        options=["All"] + index.evolutions.stages,
+        index=0,
+        format_func=lambda stage: stage if stage == "All" else f"Stage {stage} only"
     )
     
     # Final evolution filter
@@ -51,98 +238,136 @@ def main():
         value=False
     )
     
+    # Stat range filters; only ranges narrower than the data are applied
+    stat_ranges = {}
+    with st.sidebar.expander("Stat Ranges"):
+        for column in STAT_COLUMNS:
+            low, high = index.stat_bounds(column)
+            selected = st.slider(
+                DISPLAY_COLUMNS[column],
+                min_value=low,
+                max_value=high,
+                value=(low, high)
+            )
+            if selected != (low, high):
+                stat_ranges[column] = selected
+    
     # Sort options
     st.sidebar.header("Sorting")
-    sort_order = st.sidebar.radio(
-        "Sort by Total Stats",
-        options=["None", "Ascending", "Descending"],
-        index=0
+    sort_columns = st.sidebar.multiselect(
+        "Sort by",
+        options=SORT_COLUMNS,
+        default=[],
+        format_func=DISPLAY_COLUMNS.get,
+        help="Pick one or more columns; earlier picks take priority"
     )
+    sort_keys = []
+    for column in sort_columns:
+        direction = st.sidebar.radio(
+            f"{DISPLAY_COLUMNS[column]} order",
+            options=["Descending", "Ascending"],
+            index=0,
+            horizontal=True,
+            key=f"sort_direction_{column}"
+        )
+        sort_keys.append((column, direction == "Ascending"))
     
-    # Apply filters
-    filtered_df = df.copy()
+    # Normalized query for the shared query cache
+    return PokemonQuery.create(
+        types=type_filter,
+        final_only=final_evolution_only,
+        whole_family=whole_family,
+        stage=None if stage_filter == "All" else stage_filter,
+        name=name_query.strip() or None,
+        stat_ranges=stat_ranges,
+        sort_keys=sort_keys
+    )
+
+
+def render_debug_panel(record):
+    """Show span timings and cache outcomes for the last few reruns."""
+    history = st.session_state.setdefault('profile_history', deque(maxlen=PROFILE_HISTORY))
+    history.append(record)
     
-    # Type filter
-    if type_filter:
-        filtered_df = filtered_df[
-            filtered_df['type1'].isin(type_filter) | 
-            filtered_df['type2'].isin(type_filter)
-        ]
+    with st.expander(f"Debug: last {len(history)} reruns"):
+        for number, rerun in enumerate(reversed(history)):
+            caches = ", ".join(f"{name}: {status}" for name, status in rerun['caches'].items())
+            st.markdown(
+                f"**{'Latest' if number == 0 else f'-{number}'}**: "
+                f"{rerun['total_ms']:.1f} ms total" + (f" ({caches})" if caches else "")
+            )
+            st.dataframe(
+                [
+                    {
+                        'Span': '  ' * span['depth'] + span['name'],
+                        'Start (ms)': round(span['start_ms'], 2),
+                        'Duration (ms)': round(span['duration_ms'], 2),
+                    }
+                    for span in rerun['spans']
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+
+
+def main():
+    st.set_page_config(
+        page_title="Pokemon Ultra Sun Search",
+        page_icon="⚡",
+        layout="wide"
+    )
     
-    # Final evolution filter
-    if final_evolution_only:
-        filtered_df = filtered_df[filtered_df['next_evolution'].isna()]
+    st.title("⚡ Pokemon Ultra Sun Search")
+    st.markdown("Search and filter Pokemon from Pokemon Ultra Sun")
     
-    # Apply sorting
-    if sort_order == "Ascending":
-        filtered_df = filtered_df.sort_values('total_stats', ascending=True)
-    elif sort_order == "Descending":
-        filtered_df = filtered_df.sort_values('total_stats', ascending=False)
+    profiler = start_rerun()
     
-    # Display summary
-    st.subheader(f"Showing {len(filtered_df)} Pokemon")
+    # Load data
+    with st.spinner("Loading Pokemon data..."), profiler.span('load_data'):
+        store = profiler.cached('get_data_store', get_data_store)
+        index, refresh = store.poll()
+        profiler.record_cache('pokemon_data', refresh)
     
-    # Display data
-    if len(filtered_df) > 0:
-        # Format the dataframe for display
-        display_df = filtered_df.copy()
-        display_df['prev_evolution'] = display_df['prev_evolution'].fillna('-')
-        display_df['next_evolution'] = display_df['next_evolution'].fillna('-')
-        display_df['type2'] = display_df['type2'].fillna('-')
-        
-        # Reorder columns for better display
-        column_order = [
-            'name', 'type1', 'type2', 'prev_evolution', 'next_evolution',
-            'total_stats', 'hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed'
-        ]
-        display_df = display_df[column_order]
-        
-        # Rename columns for display
-        display_df.columns = [
-            'Name', 'Type 1', 'Type 2', 'Previous Evolution', 'Next Evolution',
-            'Total Stats', 'HP', 'Attack', 'Defense', 'Sp. Attack', 'Sp. Defense', 'Speed'
-        ]
-        
-        # Display as a table
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            height=600,
-            hide_index=True
+    with profiler.span('sidebar'):
+        query = render_sidebar(index)
+    
+    # Apply filters and sorting through the shared query cache
+    with profiler.span('query'):
+        rows = index.run(query)
+    
+    search_tab, team_tab, similar_tab = st.tabs(["Search", "Team Builder", "Similar Pokemon"])
+    
+    with search_tab, profiler.span('render_search'):
+        render_search_results(index, query, rows)
+    
+    with team_tab, profiler.span('render_team_builder'):
+        matchups = profiler.cached(
+            'get_type_matchups', lambda: get_type_matchups(index.version, index)
         )
-        
-        # Show statistics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Total Pokemon", len(filtered_df))
-        
-        with col2:
-            st.metric("Avg Total Stats", f"{filtered_df['total_stats'].mean():.1f}")
-        
-        with col3:
-            st.metric("Highest Stats", filtered_df['total_stats'].max())
-        
-        with col4:
-            st.metric("Lowest Stats", filtered_df['total_stats'].min())
-        
-        # Top 5 by stats
-        if len(filtered_df) >= 5:
-            st.subheader("Top 5 by Total Stats")
-            top5 = filtered_df.nlargest(5, 'total_stats')[['name', 'type1', 'type2', 'total_stats']]
-            top5.columns = ['Name', 'Type 1', 'Type 2', 'Total Stats']
-            st.table(top5.reset_index(drop=True))
-    else:
-        st.warning("No Pokemon match the selected filters.")
+        render_team_builder(index, matchups, rows)
+    
+    with similar_tab, profiler.span('render_similar'):
+        render_similar(index)
     
     # Instructions
     st.sidebar.markdown("---")
     st.sidebar.markdown("""
     ### How to Use
+    - **Name Search**: Type part of a name; close misspellings still match
     - **Type Filter**: Select one or more types to filter Pokemon
+    - **Whole Family**: Include the full evolution family of each type match
+    - **Evolution Stage**: Show only base forms, middle stages or third stages
     - **Final Evolutions**: Check to show only Pokemon that don't evolve further
-    - **Sorting**: Choose to sort by total base stats
+    - **Stat Ranges**: Narrow each base stat to a minimum and maximum
+    - **Sorting**: Sort by one or more stats, each ascending or descending
+    - **Team Builder**: Check a team's weaknesses and coverage, and get
+      suggestions for the next member
+    - **Similar Pokemon**: Find the Pokemon with the closest base stats
     """)
+    
+    record = profiler.finish()
+    if record is not None:
+        render_debug_panel(record)
 
 
 if __name__ == "__main__":
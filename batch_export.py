@@ -0,0 +1,377 @@
+"""
+Export many saved views at once.
+
+Reads a file of query specs, evaluates them in a thread or process pool
+against one in-memory PokemonIndex, and streams each result to CSV or
+Parquet chunk by chunk, so no full result frame is ever built. Ends with a
+throughput report.
+
+Usage:
+    python batch_export.py views.json --output-dir exports
+    python batch_export.py --type-final --format parquet --workers 8
+    python batch_export.py views.jsonl --executor process --report report.json
+
+A spec file is a JSON list of specs, or JSON Lines with one spec per line:
+
+    {"output": "fast_water", "types": ["Water"], "final_only": true,
+     "stat_ranges": {"speed": [100, null]}, "sort": "-speed,-total_stats",
+     "columns": ["name", "type1", "type2", "speed", "total_stats"]}
+
+Query keys are those of parse_query_params(), shared with the query
+server: sort is comma-separated columns with a '-' prefix for descending,
+and a null range bound means the column's min/max. output (a file name,
+extension optional) and columns are optional.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from pokemon_data import (
+    DISPLAY_COLUMNS,
+    POKEMON_TYPES,
+    PokemonDataStore,
+    PokemonIndex,
+    PokemonQuery,
+    parse_query_params,
+)
+
+
+DEFAULT_CHUNK_SIZE = 10000
+FORMATS = ('csv', 'parquet')
+QUERY_KEYS = ('types', 'final_only', 'whole_family', 'stage', 'name', 'stat_ranges', 'sort')
+SPEC_KEYS = QUERY_KEYS + ('output', 'columns')
+
+# Index used by export workers: set directly for threads, and by
+# _init_process() in each process of a process pool
+_index: Optional[PokemonIndex] = None
+
+
+def read_specs(path: str) -> List[dict]:
+    """
+    Read query specs from a JSON list or a JSON Lines file.
+
+    Raises:
+        ValueError: If the file is not valid JSON or a spec is not an object
+    """
+    with open(path) as f:
+        content = f.read()
+    try:
+        specs = json.loads(content)
+    except ValueError:
+        try:
+            specs = [json.loads(line) for line in content.splitlines() if line.strip()]
+        except ValueError as e:
+            raise ValueError(f"{path} is neither JSON nor JSON Lines: {e}")
+    if isinstance(specs, dict):
+        specs = [specs]
+    if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+        raise ValueError(f"{path} must contain a list of spec objects")
+    return specs
+
+
+def type_final_specs() -> List[dict]:
+    """Specs for every type x final-evolution view, sorted by total stats."""
+    specs = []
+    for type_name in POKEMON_TYPES:
+        for final_only in (False, True):
+            specs.append({
+                'output': f"{type_name.lower()}{'_final' if final_only else ''}",
+                'types': [type_name],
+                'final_only': final_only,
+                'sort': '-total_stats',
+            })
+    return specs
+
+
+def parse_spec(index: PokemonIndex, spec: dict) -> PokemonQuery:
+    """
+    Turn a spec into a normalized PokemonQuery.
+
+    Raises:
+        ValueError: On unknown keys, wrongly typed fields or invalid query values
+    """
+    unknown = sorted(set(spec) - set(SPEC_KEYS))
+    if unknown:
+        raise ValueError(f"Unknown spec keys: {', '.join(unknown)}")
+
+    def is_int(value) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    for key in ('types', 'columns'):
+        value = spec.get(key)
+        if value is not None and not (
+            isinstance(value, list) and all(isinstance(item, str) for item in value)
+        ):
+            raise ValueError(f"{key} must be a list of strings")
+    for key in ('name', 'sort', 'output'):
+        if spec.get(key) is not None and not isinstance(spec[key], str):
+            raise ValueError(f"{key} must be a string")
+    for key in ('final_only', 'whole_family'):
+        if not isinstance(spec.get(key, False), bool):
+            raise ValueError(f"{key} must be true or false")
+    if spec.get('stage') is not None and not is_int(spec['stage']):
+        raise ValueError("stage must be an integer")
+
+    stat_ranges = spec.get('stat_ranges') or {}
+    if not isinstance(stat_ranges, dict):
+        raise ValueError("stat_ranges must be an object of column: [low, high]")
+    for column, bounds in stat_ranges.items():
+        if not isinstance(bounds, list) or len(bounds) != 2 \
+                or not all(bound is None or is_int(bound) for bound in bounds):
+            raise ValueError(f"Range for {column} must be [low, high] of integers or null")
+
+    return parse_query_params(
+        index,
+        types=spec.get('types'),
+        final_only=spec.get('final_only', False),
+        whole_family=spec.get('whole_family', False),
+        stage=spec.get('stage'),
+        name=spec.get('name'),
+        stat_ranges={column: tuple(bounds) for column, bounds in stat_ranges.items()},
+        sort=spec.get('sort') or '',
+    )
+
+
+def spec_columns(spec: dict) -> List[str]:
+    """
+    Columns to export for a spec, defaulting to all of DISPLAY_COLUMNS.
+
+    Raises:
+        ValueError: On an unknown column
+    """
+    columns = spec.get('columns') or list(DISPLAY_COLUMNS)
+    for column in columns:
+        if column not in DISPLAY_COLUMNS:
+            raise ValueError(f"Unknown column: {column!r}")
+    return list(columns)
+
+
+def output_path(output_dir: str, spec: dict, position: int, fmt: str) -> str:
+    """Where a spec's export is written; the extension follows the format."""
+    name = spec.get('output')
+    if not name or not isinstance(name, str):
+        # A malformed output is reported when the spec is parsed
+        name = f"view_{position:04d}"
+    root, _ = os.path.splitext(os.path.basename(name))
+    return os.path.join(output_dir, f"{root}.{fmt}")
+
+
+def iter_chunks(index: PokemonIndex, rows: np.ndarray, columns: Sequence[str],
+                chunk_size: int):
+    """
+    Yield the rows of a result as DataFrames of at most chunk_size rows.
+
+    Values keep the data's dtypes; missing types and evolutions stay
+    missing rather than being formatted for display.
+    """
+    positions = [index.df.columns.get_loc(column) for column in columns]
+    for start in range(0, len(rows), chunk_size):
+        yield index.df.iloc[rows[start:start + chunk_size], positions]
+
+
+def write_csv(chunks, path: str, columns: Sequence[str]) -> None:
+    """Stream chunks to a CSV file, writing the header once."""
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(columns) + '\n')
+        for chunk in chunks:
+            chunk.to_csv(f, header=False, index=False)
+
+
+def write_parquet(chunks, path: str, columns: Sequence[str], index: PokemonIndex) -> None:
+    """
+    Stream chunks to a Parquet file, one row group per chunk.
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    # Fix the schema up front so an empty result still gets typed columns
+    schema = pa.Schema.from_pandas(index.df.iloc[:0][list(columns)], preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_view(spec: dict, path: str, fmt: str, chunk_size: int) -> Dict[str, object]:
+    """
+    Evaluate one spec against the worker's index and stream it to a file.
+
+    Returns:
+        Dict[str, object]: Output path, row and chunk counts, bytes written,
+                           seconds spent and the data version; or the path
+                           and an error message if the view failed
+    """
+    index = _index
+    start = time.perf_counter()
+    try:
+        query = parse_spec(index, spec)
+        columns = spec_columns(spec)
+    except ValueError as e:
+        return {'output': path, 'error': str(e)}
+    try:
+        rows = index.run(query)
+        chunks = iter_chunks(index, rows, columns, chunk_size)
+        if fmt == 'csv':
+            write_csv(chunks, path, columns)
+        else:
+            write_parquet(chunks, path, columns, index)
+    except Exception as e:
+        # One failed view must not abort the batch; drop its partial file
+        if os.path.exists(path):
+            os.remove(path)
+        message = str(e) if isinstance(e, (OSError, ValueError)) else f"{type(e).__name__}: {e}"
+        return {'output': path, 'error': message}
+    return {
+        'output': path,
+        'rows': len(rows),
+        'chunks': -(-len(rows) // chunk_size),
+        'bytes': os.path.getsize(path),
+        'seconds': time.perf_counter() - start,
+        'version': index.version,
+    }
+
+
+def _init_process() -> None:
+    """Load the index once in each worker process."""
+    global _index
+    _index = PokemonDataStore().current()
+
+
+def make_executor(kind: str, workers: int, index: PokemonIndex) -> Executor:
+    """
+    Create the worker pool.
+
+    Threads share the caller's index directly. Processes each load their
+    own index; the memory-mapped dex pages are shared through the OS page
+    cache, so only the derived structures are duplicated.
+    """
+    global _index
+    if kind == 'thread':
+        _index = index
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_process)
+
+
+def run_batch(specs: List[dict], output_dir: str, fmt: str = 'csv',
+              workers: Optional[int] = None, executor: str = 'thread',
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Export every spec and collect per-view results and overall throughput.
+
+    Returns:
+        dict: 'views' (one result per spec, in spec order) and 'summary'
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [output_path(output_dir, spec, i, fmt) for i, spec in enumerate(specs)]
+    duplicates = sorted({path for path in paths if paths.count(path) > 1})
+    if duplicates:
+        raise ValueError(f"Several specs write to {', '.join(duplicates)}")
+
+    index = PokemonDataStore().current()
+    workers = workers or min(len(specs), os.cpu_count() or 1) or 1
+    start = time.perf_counter()
+    with make_executor(executor, workers, index) as pool:
+        futures = [
+            pool.submit(export_view, spec, path, fmt, chunk_size)
+            for spec, path in zip(specs, paths)
+        ]
+        views = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    exported = [view for view in views if 'error' not in view]
+    versions = sorted({view['version'] for view in exported})
+    rows = sum(view['rows'] for view in exported)
+    size = sum(view['bytes'] for view in exported)
+    return {
+        'views': views,
+        'summary': {
+            'views': len(exported),
+            'failed': len(views) - len(exported),
+            'rows': rows,
+            'bytes': size,
+            'seconds': elapsed,
+            'views_per_second': len(exported) / elapsed if elapsed else 0.0,
+            'rows_per_second': rows / elapsed if elapsed else 0.0,
+            'mb_per_second': size / 1e6 / elapsed if elapsed else 0.0,
+            'executor': executor,
+            'workers': workers,
+            'format': fmt,
+            'chunk_size': chunk_size,
+            # More than one version means the data changed during the run
+            'versions': versions,
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    """Print per-view results followed by the throughput summary."""
+    for view in report['views']:
+        if 'error' in view:
+            print(f"FAILED {view['output']}: {view['error']}")
+        else:
+            print(f"{view['output']:<40} {view['rows']:>9} rows  {view['chunks']:>5} chunks  "
+                  f"{view['bytes'] / 1024:>10.1f} KB  {view['seconds'] * 1000:>9.1f} ms")
+
+    summary = report['summary']
+    print(
+        f"\n{summary['views']} views ({summary['failed']} failed), {summary['rows']} rows, "
+        f"{summary['bytes'] / 1e6:.2f} MB in {summary['seconds']:.3f} s "
+        f"with {summary['workers']} {summary['executor']} workers"
+    )
+    print(
+        f"{summary['views_per_second']:.1f} views/s, {summary['rows_per_second']:.0f} rows/s, "
+        f"{summary['mb_per_second']:.2f} MB/s"
+    )
+    if len(summary['versions']) > 1:
+        print("warning: the data changed during the run; views come from different versions")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export many saved views at once")
+    parser.add_argument('specs', nargs='?', help="JSON or JSON Lines file of query specs")
+    parser.add_argument('--type-final', action='store_true',
+                        help="Export every type x final-evolution view, sorted by total stats")
+    parser.add_argument('--output-dir', default='exports', help="Directory for the exported files")
+    parser.add_argument('--format', choices=FORMATS, default='csv', help="Export file format")
+    parser.add_argument('--executor', choices=('thread', 'process'), default='thread',
+                        help="Worker pool type")
+    parser.add_argument('--workers', type=int, help="Pool size (default: one per CPU)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows written per chunk")
+    parser.add_argument('--report', help="Also write the throughput report as JSON")
+    args = parser.parse_args(argv)
+
+    if bool(args.specs) == args.type_final:
+        parser.error("give either a specs file or --type-final")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+
+    try:
+        specs = type_final_specs() if args.type_final else read_specs(args.specs)
+        report = run_batch(specs, args.output_dir, args.format, args.workers,
+                           args.executor, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print_report(report)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['summary']['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
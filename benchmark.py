@@ -0,0 +1,305 @@
+"""
+Benchmark the data loading, query and rendering paths.
+
+Runs headless: the data layer is timed directly on synthetic datasets at
+multiples of the full National Dex size, and the Streamlit script is timed
+through streamlit.testing's AppTest on the shipped data. Each operation
+reports latency percentiles and peak traced memory, and the results are
+written as JSON so runs can be compared.
+
+Usage:
+    python benchmark.py                        # 1x, 10x and 100x
+    python benchmark.py --scales 1 10 --repeat 10
+    python benchmark.py --compare benchmark_results/previous.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from pokemon_data import (
+    STAT_COLUMNS,
+    PokemonIndex,
+    PokemonQuery,
+    SimilarityIndex,
+    build_dex,
+    get_pokemon_data,
+    get_type_counts,
+    load_dex,
+    read_pokemon_csv,
+)
+from type_matchups import TypeMatchups
+
+
+NATIONAL_DEX_SIZE = 807
+DEFAULT_SCALES = [1, 10, 100]
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_results')
+
+
+def make_synthetic_data(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic dataset of the given size from the shipped data.
+
+    The shipped table is tiled with a numeric suffix per copy, so names stay
+    unique and evolution references stay within their copy. Stats are
+    jittered so sorting and ranges see realistic spreads.
+    """
+    base = get_pokemon_data()
+    rng = np.random.default_rng(seed)
+    copies = -(-rows // len(base))
+
+    frames = []
+    for copy in range(copies):
+        frame = base[['name', 'type1', 'type2', 'prev_evolution', 'next_evolution']].copy()
+        if copy:
+            for column in ('name', 'prev_evolution', 'next_evolution'):
+                frame[column] = frame[column] + f'-{copy}'
+        for column in STAT_COLUMNS:
+            jitter = rng.integers(-10, 11, size=len(base))
+            frame[column] = np.clip(base[column].to_numpy() + jitter, 1, 255).astype('int16')
+        frames.append(frame)
+
+    df = pd.concat(frames, ignore_index=True).iloc[:rows].reset_index(drop=True)
+    df['total_stats'] = df[STAT_COLUMNS].sum(axis=1).astype('int16')
+    return df
+
+
+def legacy_type_scan(df: pd.DataFrame) -> List[str]:
+    """The original per-rerun type scan from app.py, kept as a baseline."""
+    all_types = set()
+    for _, row in df.iterrows():
+        if pd.notna(row['type1']):
+            all_types.add(row['type1'])
+        if pd.notna(row['type2']):
+            all_types.add(row['type2'])
+    return sorted(all_types)
+
+
+def legacy_filter_sort(df: pd.DataFrame, types: List[str]) -> pd.DataFrame:
+    """The original per-rerun filter/sort/format pipeline from app.py."""
+    filtered_df = df.copy()
+    filtered_df = filtered_df[filtered_df['type1'].isin(types) | filtered_df['type2'].isin(types)]
+    filtered_df = filtered_df[filtered_df['next_evolution'].isna()]
+    filtered_df = filtered_df.sort_values('total_stats', ascending=False)
+    display_df = filtered_df.copy()
+    display_df['prev_evolution'] = display_df['prev_evolution'].astype(object).fillna('-')
+    display_df['next_evolution'] = display_df['next_evolution'].astype(object).fillna('-')
+    display_df['type2'] = display_df['type2'].astype(object).fillna('-')
+    return display_df
+
+
+def measure(operation: Callable[[], object], repeat: int,
+            time_budget: float) -> Dict[str, float]:
+    """
+    Time an operation and trace its peak memory.
+
+    The operation runs up to `repeat` times, stopping early once the time
+    budget is spent (after at least 3 runs, or after 1 run that alone
+    exceeds the budget). It then runs once more under tracemalloc, so
+    tracing overhead does not distort the latencies.
+    """
+    samples = []
+    deadline = time.perf_counter() + time_budget
+    for i in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+        if time.perf_counter() > deadline and (i >= 2 or samples[0] > time_budget):
+            break
+
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples_ms = np.array(samples) * 1000
+    return {
+        'samples': len(samples),
+        'mean_ms': float(samples_ms.mean()),
+        'p50_ms': float(np.percentile(samples_ms, 50)),
+        'p90_ms': float(np.percentile(samples_ms, 90)),
+        'p99_ms': float(np.percentile(samples_ms, 99)),
+        'min_ms': float(samples_ms.min()),
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def data_operations(df: pd.DataFrame, workdir: str, scale: int) -> Dict[str, Callable[[], object]]:
+    """Operations timed on each synthetic dataset, by name."""
+    csv_path = os.path.join(workdir, f'pokemon_{scale}x.csv')
+    dex_path = os.path.join(workdir, f'pokemon_{scale}x.dex')
+    df.drop(columns='total_stats').to_csv(csv_path, index=False)
+    build_dex(csv_path, dex_path)
+
+    loaded = load_dex(dex_path)
+    index = PokemonIndex(loaded)
+    types = ['Water', 'Fire']
+    filtered = index.query(types=types, final_only=True, sort_keys=[('total_stats', False)])
+    multi_query = dict(
+        stat_ranges={'speed': (100, 255), 'hp': (80, 255)},
+        sort_keys=[('speed', False), ('attack', False)],
+    )
+    team = index.query(name='charizard')[:1].tolist() + index.query(name='garchomp')[:1].tolist()
+    stat_fix = [{'op': 'update', 'name': loaded['name'].iloc[0], 'values': {'speed': 100}}]
+    reshuffle = [
+        {'op': 'remove', 'name': loaded['name'].iloc[1]},
+        {'op': 'update', 'name': loaded['name'].iloc[2], 'values': {'type1': 'Dragon', 'attack': 200}},
+    ]
+    matchups = TypeMatchups(loaded)
+
+    operations = {
+        'csv_parse': lambda: read_pokemon_csv(csv_path),
+        'dex_build': lambda: build_dex(csv_path, dex_path),
+        'dex_load': lambda: load_dex(dex_path),
+        'legacy_type_scan': lambda: legacy_type_scan(loaded),
+        'type_counts': lambda: get_type_counts(loaded),
+        'index_build': lambda: PokemonIndex(loaded),
+        'index_delta_stats': lambda: index.apply_delta(stat_fix, 'benchmark'),
+        'index_delta_rows': lambda: index.apply_delta(reshuffle, 'benchmark'),
+        'legacy_filter_sort': lambda: legacy_filter_sort(loaded, types),
+        'query_type_final_sort': lambda: index.query(
+            types=types, final_only=True, sort_keys=[('total_stats', False)]
+        ),
+        'query_ranges_multisort': lambda: index.query(**multi_query),
+        'query_cached': lambda: index.run(PokemonQuery.create(types=types, final_only=True)),
+        'name_search': lambda: index.names.search('charzard', 10),
+        'display_page': lambda: index.display_frame(filtered[:50]),
+        'display_all': lambda: index.display_frame(filtered),
+        'team_rank': lambda: matchups.rank_candidates(team),
+    }
+    # All-pairs neighbour tables grow quadratically; keep the 100x run short
+    if scale <= 10:
+        operations['similarity_build'] = lambda: SimilarityIndex(loaded)
+    return operations
+
+
+def app_operations() -> Dict[str, Callable[[], object]]:
+    """Operations timed on the Streamlit script itself, using the shipped data."""
+    from streamlit.testing.v1 import AppTest
+
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    app = AppTest.from_file(app_path, default_timeout=60)
+    app.run()
+
+    def filtered_rerun():
+        app.sidebar.multiselect[0].set_value(['Water'])
+        app.run()
+        app.sidebar.multiselect[0].set_value([])
+        app.run()
+
+    return {
+        # Cached resources persist in-process, so this is a new session on a
+        # warm server rather than a cold start
+        'app_new_session': lambda: AppTest.from_file(app_path, default_timeout=60).run(),
+        'app_rerun': lambda: app.run(),
+        'app_filter_rerun': filtered_rerun,
+    }
+
+
+def run_benchmarks(scales: List[int], repeat: int, time_budget: float,
+                   include_app: bool = True) -> dict:
+    """Run every operation on every dataset and collect the results."""
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in scales:
+            rows = scale * NATIONAL_DEX_SIZE
+            df = make_synthetic_data(rows)
+            for operation, function in data_operations(df, workdir, scale).items():
+                stats = measure(function, repeat, time_budget)
+                results.append({'dataset': f'{scale}x', 'rows': rows, 'operation': operation, **stats})
+                print(f"{scale:>4}x {operation:<24} p50 {stats['p50_ms']:>10.3f} ms  "
+                      f"p99 {stats['p99_ms']:>10.3f} ms  peak {stats['peak_memory_kb']:>10.1f} KB")
+
+    if include_app:
+        rows = len(get_pokemon_data())
+        for operation, function in app_operations().items():
+            stats = measure(function, repeat, time_budget)
+            results.append({'dataset': 'app', 'rows': rows, 'operation': operation, **stats})
+            print(f" app {operation:<24} p50 {stats['p50_ms']:>10.3f} ms  "
+                  f"p99 {stats['p99_ms']:>10.3f} ms  peak {stats['peak_memory_kb']:>10.1f} KB")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(previous: dict, current: dict, threshold: float) -> List[str]:
+    """
+    Compare p50 latencies between two runs.
+
+    Returns:
+        List[str]: One line per operation slower than `threshold` times its
+                   previous p50
+    """
+    before = {(r['dataset'], r['operation']): r for r in previous['results']}
+    regressions = []
+    for result in current['results']:
+        old = before.get((result['dataset'], result['operation']))
+        if old is None or old['p50_ms'] == 0:
+            continue
+        ratio = result['p50_ms'] / old['p50_ms']
+        if ratio > threshold:
+            regressions.append(
+                f"{result['dataset']:>5} {result['operation']:<24} "
+                f"{old['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark loading, querying and rendering")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Dataset sizes as multiples of the National Dex size")
+    parser.add_argument('--repeat', type=int, default=30, help="Maximum timed runs per operation")
+    parser.add_argument('--time-budget', type=float, default=2.0,
+                        help="Seconds after which an operation stops repeating")
+    parser.add_argument('--no-app', action='store_true', help="Skip the Streamlit AppTest runs")
+    parser.add_argument('--output', help="JSON results path (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument('--compare', help="Previous results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="p50 slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scales, args.repeat, args.time_budget, not args.no_app)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        output = os.path.join(RESULTS_DIR, f'{stamp}.json')
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\nRegressions (> {args.threshold:.2f}x p50):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Build or check the compact Pokemon dex file.
+
+Usage:
+    python build_dex.py          # rebuild data/pokemon.dex from data/pokemon.csv
+    python build_dex.py --check  # exit non-zero if the dex is out of sync
+"""
+
+import argparse
+import sys
+
+from pokemon_data import DEX_PATH, SOURCE_PATH, build_dex, validate_dex
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--source', default=SOURCE_PATH, help="Source-of-truth CSV")
+    parser.add_argument('--dex', default=DEX_PATH, help="Dex file to build or check")
+    parser.add_argument(
+        '--check', action='store_true',
+        help="Validate the dex against the source instead of rebuilding it"
+    )
+    args = parser.parse_args()
+    
+    if not args.check:
+        try:
+            build_dex(args.source, args.dex)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 1
+    
+    problems = validate_dex(args.source, args.dex)
+    for problem in problems:
+        print(f"error: {problem}", file=sys.stderr)
+    if problems:
+        return 1
+    
+    print(f"{args.dex} is in sync with {args.source}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
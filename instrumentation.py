@@ -0,0 +1,160 @@
+"""
+Pokemon App Instrumentation
+Opt-in timing spans and cache hit/miss tracking for each app rerun.
+
+Profiling is enabled by setting POKEMON_PROFILE=1. Spans are then written as
+one JSON line per rerun to POKEMON_PROFILE_LOG (default: profile_log.jsonl).
+When disabled, every call goes to a shared no-op profiler whose span() hands
+back one preallocated null context, so the instrumented code pays only a
+method call per span.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, TypeVar
+
+
+PROFILE_ENV_VAR = 'POKEMON_PROFILE'
+PROFILE_LOG_ENV_VAR = 'POKEMON_PROFILE_LOG'
+DEFAULT_LOG_PATH = 'profile_log.jsonl'
+
+T = TypeVar('T')
+
+_log_lock = threading.Lock()
+_local = threading.local()
+
+
+def profiling_enabled() -> bool:
+    """Return whether POKEMON_PROFILE is set to a true value."""
+    return os.environ.get(PROFILE_ENV_VAR, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def record_cache_miss(name: str) -> None:
+    """
+    Count a miss; call this first thing in a cached function's body.
+
+    Cached bodies only run on a miss, and on the thread of the rerun that
+    missed, so the miss goes to that thread's profiler and concurrent
+    sessions never see each other's misses.
+    """
+    current_profiler().record_miss(name)
+
+
+class RerunProfiler:
+    """Collects named spans and cache outcomes for one rerun."""
+
+    def __init__(self, log_path: Optional[str] = None):
+        self.log_path = log_path
+        self.started = time.perf_counter()
+        self.timestamp = datetime.now(timezone.utc).isoformat()
+        self.spans: List[Dict[str, object]] = []
+        self.caches: Dict[str, str] = {}
+        self._misses: Dict[str, int] = {}
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as a named span."""
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.spans.append({
+                'name': name,
+                'depth': self._depth,
+                'start_ms': (start - self.started) * 1000,
+                'duration_ms': (time.perf_counter() - start) * 1000,
+            })
+
+    def cached(self, name: str, function: Callable[[], T]) -> T:
+        """
+        Call a cached function inside a span and record whether it hit.
+
+        The function must call record_cache_miss(name) in its body.
+        """
+        misses = self._misses.get(name, 0)
+        with self.span(name):
+            result = function()
+        self.caches[name] = 'miss' if self._misses.get(name, 0) > misses else 'hit'
+        return result
+
+    def record_miss(self, name: str) -> None:
+        """Count a miss of the named cache during this rerun."""
+        self._misses[name] = self._misses.get(name, 0) + 1
+
+    def record_cache(self, name: str, status: str) -> None:
+        """Record the outcome of a cache that reports its own status."""
+        self.caches[name] = status
+
+    def finish(self) -> Dict[str, object]:
+        """
+        Close the rerun, append it to the log file and return its record.
+        """
+        record = {
+            'timestamp': self.timestamp,
+            'total_ms': (time.perf_counter() - self.started) * 1000,
+            # Spans are appended as they close; report them in start order
+            'spans': sorted(self.spans, key=lambda span: span['start_ms']),
+            'caches': self.caches,
+        }
+        if self.log_path:
+            line = json.dumps(record)
+            with _log_lock, open(self.log_path, 'a') as f:
+                f.write(line + '\n')
+        return record
+
+
+class _NullProfiler:
+    """Profiler used when instrumentation is disabled; does nothing."""
+
+    _span = contextlib.nullcontext()
+    caches: Dict[str, str] = {}
+
+    def span(self, name: str):
+        return self._span
+
+    def cached(self, name: str, function: Callable[[], T]) -> T:
+        return function()
+
+    def record_miss(self, name: str) -> None:
+        pass
+
+    def record_cache(self, name: str, status: str) -> None:
+        pass
+
+    def finish(self) -> None:
+        return None
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def start_rerun(enabled: Optional[bool] = None):
+    """
+    Begin profiling a rerun on the current thread.
+
+    Args:
+        enabled: Force profiling on or off (defaults to profiling_enabled())
+
+    Returns:
+        RerunProfiler, or the shared no-op profiler when disabled
+    """
+    if enabled is None:
+        enabled = profiling_enabled()
+    if enabled:
+        profiler = RerunProfiler(os.environ.get(PROFILE_LOG_ENV_VAR, DEFAULT_LOG_PATH))
+    else:
+        profiler = NULL_PROFILER
+    _local.profiler = profiler
+    return profiler
+
+
+def current_profiler():
+    """Return the profiler of the rerun running on this thread."""
+    return getattr(_local, 'profiler', NULL_PROFILER)
@@ -3,197 +3,1727 @@ Pokemon Ultra Sun Data Module
 Provides Pokemon data for the search application.
 """
 
+import bisect
+import functools
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# Source-of-truth CSV and the compact binary built from it
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SOURCE_PATH = os.path.join(DATA_DIR, 'pokemon.csv')
+DEX_PATH = os.path.join(DATA_DIR, 'pokemon.dex')
+DEX_MAGIC = b'PKMNDEX\x00'
+DEX_FORMAT_VERSION = 1
+DEX_ALIGNMENT = 16
+
+
+# Shared category set for the type1/type2 columns
+POKEMON_TYPES = [
+    'Bug', 'Dark', 'Dragon', 'Electric', 'Fairy', 'Fighting', 'Fire', 'Flying', 'Ghost',
+    'Grass', 'Ground', 'Ice', 'Normal', 'Poison', 'Psychic', 'Rock', 'Steel', 'Water',
+]
+TYPE_DTYPE = pd.CategoricalDtype(POKEMON_TYPES)
+
+STAT_COLUMNS = ['hp', 'attack', 'defense', 'sp_attack', 'sp_defense', 'speed']
+SORT_COLUMNS = ['total_stats'] + STAT_COLUMNS
+
+DISPLAY_COLUMNS = {
+    'name': 'Name',
+    'type1': 'Type 1',
+    'type2': 'Type 2',
+    'prev_evolution': 'Previous Evolution',
+    'next_evolution': 'Next Evolution',
+    'total_stats': 'Total Stats',
+    'hp': 'HP',
+    'attack': 'Attack',
+    'defense': 'Defense',
+    'sp_attack': 'Sp. Attack',
+    'sp_defense': 'Sp. Defense',
+    'speed': 'Speed',
+}
+
+
+def read_pokemon_csv(path: str = SOURCE_PATH) -> pd.DataFrame:
+    """
+    Parse the source-of-truth CSV into the canonical DataFrame layout.
+    
+    Args:
+        path: Path to the source CSV
+    
+    Returns:
+        pd.DataFrame: Same layout as get_pokemon_data()
+    
+    Raises:
+        ValueError: If a type is not in POKEMON_TYPES or type1 is missing
+    """
+    df = pd.read_csv(path, dtype={column: 'int16' for column in STAT_COLUMNS})
+    
+    # Store both type columns against the shared type vocabulary; the cast
+    # turns unknown types into missing values, so reject those first
+    for column in ('type1', 'type2'):
+        raw = df[column]
+        typed = raw.astype(TYPE_DTYPE)
+        unknown = raw.notna() & typed.isna()
+        if unknown.any():
+            row = np.flatnonzero(unknown)[0]
+            raise ValueError(
+                f"{path}: unknown {column} {raw.iloc[row]!r} for {df['name'].iloc[row]!r}"
+            )
+        df[column] = typed
+    missing = df['type1'].isna()
+    if missing.any():
+        raise ValueError(f"{path}: {df['name'][missing].iloc[0]!r} has no type1")
+    
+    # Calculate total stats
+    df['total_stats'] = df[STAT_COLUMNS].sum(axis=1).astype('int16')
+    
+    df.attrs['version'] = _file_sha256(path)
+    return df
+
+
+def _file_sha256(path: str) -> str:
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
-def get_pokemon_data() -> pd.DataFrame:
+def build_dex(source_path: str = SOURCE_PATH, dex_path: str = DEX_PATH) -> None:
+    """
+    Serialize the source CSV into the compact columnar dex file.
+    
+    Layout: an 8-byte magic, a little-endian uint32 header length, a JSON
+    header describing each array (dtype, shape, byte offset) and then the
+    arrays themselves, each aligned to DEX_ALIGNMENT bytes:
+    
+        stats        int16 (7, N)  STAT_COLUMNS followed by total_stats
+        type_codes   int8  (2, N)  TYPE_DTYPE codes for type1/type2, -1 if none
+        string_ids   int32 (3, N)  name/prev_evolution/next_evolution as indexes
+                                   into the string table, -1 if none
+        string_offsets int32 (S + 1,)  byte offsets of each string in the blob
+        string_blob  uint8 (B,)    UTF-8 encoded strings, concatenated
+    
+    The header also records the SHA-256 of the source CSV, which is how
+    get_pokemon_data() detects a stale dex file.
+    
+    Args:
+        source_path: Path to the source CSV
+        dex_path: Path of the dex file to write
+    """
+    df = read_pokemon_csv(source_path)
+    
+    # String table shared by names and evolution references
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+    id_columns = []
+    for column in ('name', 'prev_evolution', 'next_evolution'):
+        ids = np.full(len(df), -1, dtype=np.int32)
+        for row, value in enumerate(df[column]):
+            if pd.notna(value):
+                if value not in string_ids:
+                    string_ids[value] = len(strings)
+                    strings.append(value)
+                ids[row] = string_ids[value]
+        id_columns.append(ids)
+    
+    encoded = [value.encode('utf-8') for value in strings]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+    string_offsets[1:] = np.cumsum([len(value) for value in encoded])
+    
+    arrays = {
+        'stats': df[STAT_COLUMNS + ['total_stats']].to_numpy(dtype='<i2').T.copy(),
+        'type_codes': np.stack([
+            df['type1'].cat.codes.to_numpy(), df['type2'].cat.codes.to_numpy()
+        ]).astype('i1'),
+        'string_ids': np.stack(id_columns).astype('<i4'),
+        'string_offsets': string_offsets.astype('<i4'),
+        'string_blob': np.frombuffer(b''.join(encoded), dtype='u1'),
+    }
+    
+    # Lay the arrays out after the header, each on an aligned offset
+    layout = {}
+    offset = 0
+    for key, array in arrays.items():
+        layout[key] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += -(-array.nbytes // DEX_ALIGNMENT) * DEX_ALIGNMENT
+    header = json.dumps({
+        'version': DEX_FORMAT_VERSION,
+        'rows': len(df),
+        'types': POKEMON_TYPES,
+        'source_sha256': _file_sha256(source_path),
+        'arrays': layout,
+    }).encode('utf-8')
+    data_start = -(-(len(DEX_MAGIC) + 4 + len(header)) // DEX_ALIGNMENT) * DEX_ALIGNMENT
+    
+    # Write to a private temp file next to the target, so concurrent builders
+    # never share a half-written file, then swap it in atomically
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(dex_path)), prefix='.pokemon-', suffix='.dex.tmp'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(DEX_MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            for key, array in arrays.items():
+                f.seek(data_start + layout[key]['offset'])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, dex_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_dex_header(dex_path: str = DEX_PATH) -> dict:
+    """
+    Read the JSON header of a dex file.
+    
+    Returns:
+        dict: Header with version, rows, types, source_sha256 and arrays, plus
+              'data_start', the byte offset of the first array
+    
+    Raises:
+        ValueError: If the file is not a dex file of the supported version
+    """
+    with open(dex_path, 'rb') as f:
+        if f.read(len(DEX_MAGIC)) != DEX_MAGIC:
+            raise ValueError(f"{dex_path} is not a Pokemon dex file")
+        (header_length,) = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_length))
+    if header['version'] != DEX_FORMAT_VERSION:
+        raise ValueError(
+            f"{dex_path} has format version {header['version']}, "
+            f"expected {DEX_FORMAT_VERSION}"
+        )
+    if header['types'] != POKEMON_TYPES:
+        raise ValueError(f"{dex_path} was built with a different type vocabulary")
+    header['data_start'] = -(-(len(DEX_MAGIC) + 4 + header_length) // DEX_ALIGNMENT) * DEX_ALIGNMENT
+    return header
+
+
+def load_dex(dex_path: str = DEX_PATH) -> pd.DataFrame:
+    """
+    Load the dex file into a DataFrame by memory-mapping it.
+    
+    The numeric arrays are read-only views of the mapping, so the pages are
+    shared between worker processes through the OS page cache. Only the
+    string table is decoded into Python objects.
+    
+    Args:
+        dex_path: Path of the dex file
+    
+    Returns:
+        pd.DataFrame: Same layout as get_pokemon_data()
+    """
+    header = read_dex_header(dex_path)
+    buffer = np.memmap(dex_path, dtype='u1', mode='r')
+    
+    arrays = {}
+    for key, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        start = header['data_start'] + spec['offset']
+        count = int(np.prod(spec['shape']))
+        arrays[key] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+    
+    # Decode the string table once; the extra trailing None makes id -1 map
+    # to a missing value
+    blob = arrays['string_blob'].tobytes()
+    offsets = arrays['string_offsets']
+    table = np.array(
+        [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)] + [None],
+        dtype=object
+    )
+    
+    # Build the frame around the stats block so the numeric columns stay
+    # views of the mapping, then insert the decoded columns in front
+    df = pd.DataFrame(arrays['stats'].T, columns=STAT_COLUMNS + ['total_stats'], copy=False)
+    string_ids = arrays['string_ids']
+    type_codes = arrays['type_codes']
+    df.insert(0, 'name', table[string_ids[0]])
+    df.insert(1, 'type1', pd.Categorical.from_codes(type_codes[0], dtype=TYPE_DTYPE))
+    df.insert(2, 'type2', pd.Categorical.from_codes(type_codes[1], dtype=TYPE_DTYPE))
+    df.insert(3, 'prev_evolution', table[string_ids[1]])
+    df.insert(4, 'next_evolution', table[string_ids[2]])
+    
+    df.attrs['version'] = header['source_sha256']
+    return df
+
+
+def validate_dex(source_path: str = SOURCE_PATH, dex_path: str = DEX_PATH) -> List[str]:
+    """
+    Check that the dex file matches the source CSV.
+    
+    Compares the recorded source checksum and then every value of the decoded
+    table against a fresh parse of the CSV.
+    
+    Returns:
+        List[str]: Human-readable problems; empty when the files are in sync
+    """
+    try:
+        header = read_dex_header(dex_path)
+    except (OSError, ValueError) as e:
+        return [str(e)]
+    
+    problems = []
+    if header['source_sha256'] != _file_sha256(source_path):
+        problems.append(f"{dex_path} was built from a different version of {source_path}")
+    
+    try:
+        expected = read_pokemon_csv(source_path)
+    except ValueError as e:
+        problems.append(str(e))
+        return problems
+    actual = load_dex(dex_path)
+    if len(actual) != len(expected):
+        problems.append(f"row count differs: dex has {len(actual)}, source has {len(expected)}")
+        return problems
+    
+    for column in expected.columns:
+        left = expected[column].astype(object).where(expected[column].notna(), None).to_numpy()
+        right = actual[column].astype(object).where(actual[column].notna(), None).to_numpy()
+        mismatched = np.flatnonzero(left != right)
+        if len(mismatched):
+            problems.append(
+                f"column {column!r} differs in {len(mismatched)} rows, "
+                f"first at {expected['name'].iloc[mismatched[0]]!r}"
+            )
+    return problems
+
+
+def dex_is_current(source_path: str = SOURCE_PATH, dex_path: str = DEX_PATH) -> bool:
+    """
+    Cheap staleness check: the dex exists and was built from the current CSV.
+    
+    When the CSV is not shipped, any readable dex file counts as current.
+    """
+    try:
+        header = read_dex_header(dex_path)
+    except (OSError, ValueError):
+        return False
+    if not os.path.exists(source_path):
+        return True
+    return header['source_sha256'] == _file_sha256(source_path)
+
+
+def get_pokemon_data(source_path: str = SOURCE_PATH, dex_path: str = DEX_PATH) -> pd.DataFrame:
     """
     Returns static Pokemon data from Pokemon Ultra Sun (Generation 1-7).
     
+    Data is memory-mapped from the compact dex file, which is rebuilt from
+    the source CSV first if it is missing or stale. If the dex cannot be
+    written (e.g. a read-only deployment), the CSV is parsed directly.
+    Delta files are not applied; see PokemonDataStore.
+    
+    Args:
+        source_path: Path to the source CSV
+        dex_path: Path of the dex file
+    
     Returns:
         pd.DataFrame: DataFrame with columns: name, type1, type2, prev_evolution,
                       next_evolution, hp, attack, defense, sp_attack, sp_defense,
-                      speed, total_stats
-    """
-    # Comprehensive Pokemon data from Gen 1-7 (Pokemon Ultra Sun)
-    # This includes a representative sample of Pokemon from each generation
-    pokemon_data = [
-        # Gen 1 Starters and Evolutions
-        {"name": "Bulbasaur", "type1": "Grass", "type2": "Poison", "prev_evolution": None, "next_evolution": "Ivysaur", "hp": 45, "attack": 49, "defense": 49, "sp_attack": 65, "sp_defense": 65, "speed": 45},
-        {"name": "Ivysaur", "type1": "Grass", "type2": "Poison", "prev_evolution": "Bulbasaur", "next_evolution": "Venusaur", "hp": 60, "attack": 62, "defense": 63, "sp_attack": 80, "sp_defense": 80, "speed": 60},
-        {"name": "Venusaur", "type1": "Grass", "type2": "Poison", "prev_evolution": "Ivysaur", "next_evolution": None, "hp": 80, "attack": 82, "defense": 83, "sp_attack": 100, "sp_defense": 100, "speed": 80},
-        {"name": "Charmander", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Charmeleon", "hp": 39, "attack": 52, "defense": 43, "sp_attack": 60, "sp_defense": 50, "speed": 65},
-        {"name": "Charmeleon", "type1": "Fire", "type2": None, "prev_evolution": "Charmander", "next_evolution": "Charizard", "hp": 58, "attack": 64, "defense": 58, "sp_attack": 80, "sp_defense": 65, "speed": 80},
-        {"name": "Charizard", "type1": "Fire", "type2": "Flying", "prev_evolution": "Charmeleon", "next_evolution": None, "hp": 78, "attack": 84, "defense": 78, "sp_attack": 109, "sp_defense": 85, "speed": 100},
-        {"name": "Squirtle", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Wartortle", "hp": 44, "attack": 48, "defense": 65, "sp_attack": 50, "sp_defense": 64, "speed": 43},
-        {"name": "Wartortle", "type1": "Water", "type2": None, "prev_evolution": "Squirtle", "next_evolution": "Blastoise", "hp": 59, "attack": 63, "defense": 80, "sp_attack": 65, "sp_defense": 80, "speed": 58},
-        {"name": "Blastoise", "type1": "Water", "type2": None, "prev_evolution": "Wartortle", "next_evolution": None, "hp": 79, "attack": 83, "defense": 100, "sp_attack": 85, "sp_defense": 105, "speed": 78},
-        
-        # More Gen 1 Pokemon
-        {"name": "Pikachu", "type1": "Electric", "type2": None, "prev_evolution": "Pichu", "next_evolution": "Raichu", "hp": 35, "attack": 55, "defense": 40, "sp_attack": 50, "sp_defense": 50, "speed": 90},
-        {"name": "Raichu", "type1": "Electric", "type2": None, "prev_evolution": "Pikachu", "next_evolution": None, "hp": 60, "attack": 90, "defense": 55, "sp_attack": 90, "sp_defense": 80, "speed": 110},
-        {"name": "Meowth", "type1": "Normal", "type2": None, "prev_evolution": None, "next_evolution": "Persian", "hp": 40, "attack": 45, "defense": 35, "sp_attack": 40, "sp_defense": 40, "speed": 90},
-        {"name": "Persian", "type1": "Normal", "type2": None, "prev_evolution": "Meowth", "next_evolution": None, "hp": 65, "attack": 70, "defense": 60, "sp_attack": 65, "sp_defense": 65, "speed": 115},
-        {"name": "Psyduck", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Golduck", "hp": 50, "attack": 52, "defense": 48, "sp_attack": 65, "sp_defense": 50, "speed": 55},
-        {"name": "Golduck", "type1": "Water", "type2": None, "prev_evolution": "Psyduck", "next_evolution": None, "hp": 80, "attack": 82, "defense": 78, "sp_attack": 95, "sp_defense": 80, "speed": 85},
-        {"name": "Machop", "type1": "Fighting", "type2": None, "prev_evolution": None, "next_evolution": "Machoke", "hp": 70, "attack": 80, "defense": 50, "sp_attack": 35, "sp_defense": 35, "speed": 35},
-        {"name": "Machoke", "type1": "Fighting", "type2": None, "prev_evolution": "Machop", "next_evolution": "Machamp", "hp": 80, "attack": 100, "defense": 70, "sp_attack": 50, "sp_defense": 60, "speed": 45},
-        {"name": "Machamp", "type1": "Fighting", "type2": None, "prev_evolution": "Machoke", "next_evolution": None, "hp": 90, "attack": 130, "defense": 80, "sp_attack": 65, "sp_defense": 85, "speed": 55},
-        {"name": "Geodude", "type1": "Rock", "type2": "Ground", "prev_evolution": None, "next_evolution": "Graveler", "hp": 40, "attack": 80, "defense": 100, "sp_attack": 30, "sp_defense": 30, "speed": 20},
-        {"name": "Graveler", "type1": "Rock", "type2": "Ground", "prev_evolution": "Geodude", "next_evolution": "Golem", "hp": 55, "attack": 95, "defense": 115, "sp_attack": 45, "sp_defense": 45, "speed": 35},
-        {"name": "Golem", "type1": "Rock", "type2": "Ground", "prev_evolution": "Graveler", "next_evolution": None, "hp": 80, "attack": 120, "defense": 130, "sp_attack": 55, "sp_defense": 65, "speed": 45},
-        {"name": "Gastly", "type1": "Ghost", "type2": "Poison", "prev_evolution": None, "next_evolution": "Haunter", "hp": 30, "attack": 35, "defense": 30, "sp_attack": 100, "sp_defense": 35, "speed": 80},
-        {"name": "Haunter", "type1": "Ghost", "type2": "Poison", "prev_evolution": "Gastly", "next_evolution": "Gengar", "hp": 45, "attack": 50, "defense": 45, "sp_attack": 115, "sp_defense": 55, "speed": 95},
-        {"name": "Gengar", "type1": "Ghost", "type2": "Poison", "prev_evolution": "Haunter", "next_evolution": None, "hp": 60, "attack": 65, "defense": 60, "sp_attack": 130, "sp_defense": 75, "speed": 110},
-        {"name": "Magikarp", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Gyarados", "hp": 20, "attack": 10, "defense": 55, "sp_attack": 15, "sp_defense": 20, "speed": 80},
-        {"name": "Gyarados", "type1": "Water", "type2": "Flying", "prev_evolution": "Magikarp", "next_evolution": None, "hp": 95, "attack": 125, "defense": 79, "sp_attack": 60, "sp_defense": 100, "speed": 81},
-        {"name": "Eevee", "type1": "Normal", "type2": None, "prev_evolution": None, "next_evolution": "Vaporeon", "hp": 55, "attack": 55, "defense": 50, "sp_attack": 45, "sp_defense": 65, "speed": 55},
-        {"name": "Vaporeon", "type1": "Water", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 130, "attack": 65, "defense": 60, "sp_attack": 110, "sp_defense": 95, "speed": 65},
-        {"name": "Jolteon", "type1": "Electric", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 65, "attack": 65, "defense": 60, "sp_attack": 110, "sp_defense": 95, "speed": 130},
-        {"name": "Flareon", "type1": "Fire", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 65, "attack": 130, "defense": 60, "sp_attack": 95, "sp_defense": 110, "speed": 65},
-        {"name": "Dratini", "type1": "Dragon", "type2": None, "prev_evolution": None, "next_evolution": "Dragonair", "hp": 41, "attack": 64, "defense": 45, "sp_attack": 50, "sp_defense": 50, "speed": 50},
-        {"name": "Dragonair", "type1": "Dragon", "type2": None, "prev_evolution": "Dratini", "next_evolution": "Dragonite", "hp": 61, "attack": 84, "defense": 65, "sp_attack": 70, "sp_defense": 70, "speed": 70},
-        {"name": "Dragonite", "type1": "Dragon", "type2": "Flying", "prev_evolution": "Dragonair", "next_evolution": None, "hp": 91, "attack": 134, "defense": 95, "sp_attack": 100, "sp_defense": 100, "speed": 80},
-        {"name": "Mewtwo", "type1": "Psychic", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 106, "attack": 110, "defense": 90, "sp_attack": 154, "sp_defense": 90, "speed": 130},
-        {"name": "Mew", "type1": "Psychic", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 100, "defense": 100, "sp_attack": 100, "sp_defense": 100, "speed": 100},
-        
-        # Gen 2 Pokemon
-        {"name": "Chikorita", "type1": "Grass", "type2": None, "prev_evolution": None, "next_evolution": "Bayleef", "hp": 45, "attack": 49, "defense": 65, "sp_attack": 49, "sp_defense": 65, "speed": 45},
-        {"name": "Bayleef", "type1": "Grass", "type2": None, "prev_evolution": "Chikorita", "next_evolution": "Meganium", "hp": 60, "attack": 62, "defense": 80, "sp_attack": 63, "sp_defense": 80, "speed": 60},
-        {"name": "Meganium", "type1": "Grass", "type2": None, "prev_evolution": "Bayleef", "next_evolution": None, "hp": 80, "attack": 82, "defense": 100, "sp_attack": 83, "sp_defense": 100, "speed": 80},
-        {"name": "Cyndaquil", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Quilava", "hp": 39, "attack": 52, "defense": 43, "sp_attack": 60, "sp_defense": 50, "speed": 65},
-        {"name": "Quilava", "type1": "Fire", "type2": None, "prev_evolution": "Cyndaquil", "next_evolution": "Typhlosion", "hp": 58, "attack": 64, "defense": 58, "sp_attack": 80, "sp_defense": 65, "speed": 80},
-        {"name": "Typhlosion", "type1": "Fire", "type2": None, "prev_evolution": "Quilava", "next_evolution": None, "hp": 78, "attack": 84, "defense": 78, "sp_attack": 109, "sp_defense": 85, "speed": 100},
-        {"name": "Totodile", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Croconaw", "hp": 50, "attack": 65, "defense": 64, "sp_attack": 44, "sp_defense": 48, "speed": 43},
-        {"name": "Croconaw", "type1": "Water", "type2": None, "prev_evolution": "Totodile", "next_evolution": "Feraligatr", "hp": 65, "attack": 80, "defense": 80, "sp_attack": 59, "sp_defense": 63, "speed": 58},
-        {"name": "Feraligatr", "type1": "Water", "type2": None, "prev_evolution": "Croconaw", "next_evolution": None, "hp": 85, "attack": 105, "defense": 100, "sp_attack": 79, "sp_defense": 83, "speed": 78},
-        {"name": "Pichu", "type1": "Electric", "type2": None, "prev_evolution": None, "next_evolution": "Pikachu", "hp": 20, "attack": 40, "defense": 15, "sp_attack": 35, "sp_defense": 35, "speed": 60},
-        {"name": "Togepi", "type1": "Fairy", "type2": None, "prev_evolution": None, "next_evolution": "Togetic", "hp": 35, "attack": 20, "defense": 65, "sp_attack": 40, "sp_defense": 65, "speed": 20},
-        {"name": "Togetic", "type1": "Fairy", "type2": "Flying", "prev_evolution": "Togepi", "next_evolution": "Togekiss", "hp": 55, "attack": 40, "defense": 85, "sp_attack": 80, "sp_defense": 105, "speed": 40},
-        {"name": "Mareep", "type1": "Electric", "type2": None, "prev_evolution": None, "next_evolution": "Flaaffy", "hp": 55, "attack": 40, "defense": 40, "sp_attack": 65, "sp_defense": 45, "speed": 35},
-        {"name": "Flaaffy", "type1": "Electric", "type2": None, "prev_evolution": "Mareep", "next_evolution": "Ampharos", "hp": 70, "attack": 55, "defense": 55, "sp_attack": 80, "sp_defense": 60, "speed": 45},
-        {"name": "Ampharos", "type1": "Electric", "type2": None, "prev_evolution": "Flaaffy", "next_evolution": None, "hp": 90, "attack": 75, "defense": 85, "sp_attack": 115, "sp_defense": 90, "speed": 55},
-        {"name": "Espeon", "type1": "Psychic", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 65, "attack": 65, "defense": 60, "sp_attack": 130, "sp_defense": 95, "speed": 110},
-        {"name": "Umbreon", "type1": "Dark", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 95, "attack": 65, "defense": 110, "sp_attack": 60, "sp_defense": 130, "speed": 65},
-        {"name": "Tyranitar", "type1": "Rock", "type2": "Dark", "prev_evolution": "Pupitar", "next_evolution": None, "hp": 100, "attack": 134, "defense": 110, "sp_attack": 95, "sp_defense": 100, "speed": 61},
-        {"name": "Lugia", "type1": "Psychic", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 106, "attack": 90, "defense": 130, "sp_attack": 90, "sp_defense": 154, "speed": 110},
-        {"name": "Ho-Oh", "type1": "Fire", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 106, "attack": 130, "defense": 90, "sp_attack": 110, "sp_defense": 154, "speed": 90},
-        
-        # Gen 3 Pokemon
-        {"name": "Treecko", "type1": "Grass", "type2": None, "prev_evolution": None, "next_evolution": "Grovyle", "hp": 40, "attack": 45, "defense": 35, "sp_attack": 65, "sp_defense": 55, "speed": 70},
-        {"name": "Grovyle", "type1": "Grass", "type2": None, "prev_evolution": "Treecko", "next_evolution": "Sceptile", "hp": 50, "attack": 65, "defense": 45, "sp_attack": 85, "sp_defense": 65, "speed": 95},
-        {"name": "Sceptile", "type1": "Grass", "type2": None, "prev_evolution": "Grovyle", "next_evolution": None, "hp": 70, "attack": 85, "defense": 65, "sp_attack": 105, "sp_defense": 85, "speed": 120},
-        {"name": "Torchic", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Combusken", "hp": 45, "attack": 60, "defense": 40, "sp_attack": 70, "sp_defense": 50, "speed": 45},
-        {"name": "Combusken", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Torchic", "next_evolution": "Blaziken", "hp": 60, "attack": 85, "defense": 60, "sp_attack": 85, "sp_defense": 60, "speed": 55},
-        {"name": "Blaziken", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Combusken", "next_evolution": None, "hp": 80, "attack": 120, "defense": 70, "sp_attack": 110, "sp_defense": 70, "speed": 80},
-        {"name": "Mudkip", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Marshtomp", "hp": 50, "attack": 70, "defense": 50, "sp_attack": 50, "sp_defense": 50, "speed": 40},
-        {"name": "Marshtomp", "type1": "Water", "type2": "Ground", "prev_evolution": "Mudkip", "next_evolution": "Swampert", "hp": 70, "attack": 85, "defense": 70, "sp_attack": 60, "sp_defense": 70, "speed": 50},
-        {"name": "Swampert", "type1": "Water", "type2": "Ground", "prev_evolution": "Marshtomp", "next_evolution": None, "hp": 100, "attack": 110, "defense": 90, "sp_attack": 85, "sp_defense": 90, "speed": 60},
-        {"name": "Ralts", "type1": "Psychic", "type2": "Fairy", "prev_evolution": None, "next_evolution": "Kirlia", "hp": 28, "attack": 25, "defense": 25, "sp_attack": 45, "sp_defense": 35, "speed": 40},
-        {"name": "Kirlia", "type1": "Psychic", "type2": "Fairy", "prev_evolution": "Ralts", "next_evolution": "Gardevoir", "hp": 38, "attack": 35, "defense": 35, "sp_attack": 65, "sp_defense": 55, "speed": 50},
-        {"name": "Gardevoir", "type1": "Psychic", "type2": "Fairy", "prev_evolution": "Kirlia", "next_evolution": None, "hp": 68, "attack": 65, "defense": 65, "sp_attack": 125, "sp_defense": 115, "speed": 80},
-        {"name": "Aggron", "type1": "Steel", "type2": "Rock", "prev_evolution": "Lairon", "next_evolution": None, "hp": 70, "attack": 110, "defense": 180, "sp_attack": 60, "sp_defense": 60, "speed": 50},
-        {"name": "Flygon", "type1": "Ground", "type2": "Dragon", "prev_evolution": "Vibrava", "next_evolution": None, "hp": 80, "attack": 100, "defense": 80, "sp_attack": 80, "sp_defense": 80, "speed": 100},
-        {"name": "Metagross", "type1": "Steel", "type2": "Psychic", "prev_evolution": "Metang", "next_evolution": None, "hp": 80, "attack": 135, "defense": 130, "sp_attack": 95, "sp_defense": 90, "speed": 70},
-        {"name": "Rayquaza", "type1": "Dragon", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 105, "attack": 150, "defense": 90, "sp_attack": 150, "sp_defense": 90, "speed": 95},
-        {"name": "Kyogre", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 100, "defense": 90, "sp_attack": 150, "sp_defense": 140, "speed": 90},
-        {"name": "Groudon", "type1": "Ground", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 150, "defense": 140, "sp_attack": 100, "sp_defense": 90, "speed": 90},
-        
-        # Gen 4 Pokemon
-        {"name": "Turtwig", "type1": "Grass", "type2": None, "prev_evolution": None, "next_evolution": "Grotle", "hp": 55, "attack": 68, "defense": 64, "sp_attack": 45, "sp_defense": 55, "speed": 31},
-        {"name": "Grotle", "type1": "Grass", "type2": None, "prev_evolution": "Turtwig", "next_evolution": "Torterra", "hp": 75, "attack": 89, "defense": 85, "sp_attack": 55, "sp_defense": 65, "speed": 36},
-        {"name": "Torterra", "type1": "Grass", "type2": "Ground", "prev_evolution": "Grotle", "next_evolution": None, "hp": 95, "attack": 109, "defense": 105, "sp_attack": 75, "sp_defense": 85, "speed": 56},
-        {"name": "Chimchar", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Monferno", "hp": 44, "attack": 58, "defense": 44, "sp_attack": 58, "sp_defense": 44, "speed": 61},
-        {"name": "Monferno", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Chimchar", "next_evolution": "Infernape", "hp": 64, "attack": 78, "defense": 52, "sp_attack": 78, "sp_defense": 52, "speed": 81},
-        {"name": "Infernape", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Monferno", "next_evolution": None, "hp": 76, "attack": 104, "defense": 71, "sp_attack": 104, "sp_defense": 71, "speed": 108},
-        {"name": "Piplup", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Prinplup", "hp": 53, "attack": 51, "defense": 53, "sp_attack": 61, "sp_defense": 56, "speed": 40},
-        {"name": "Prinplup", "type1": "Water", "type2": None, "prev_evolution": "Piplup", "next_evolution": "Empoleon", "hp": 64, "attack": 66, "defense": 68, "sp_attack": 81, "sp_defense": 76, "speed": 50},
-        {"name": "Empoleon", "type1": "Water", "type2": "Steel", "prev_evolution": "Prinplup", "next_evolution": None, "hp": 84, "attack": 86, "defense": 88, "sp_attack": 111, "sp_defense": 101, "speed": 60},
-        {"name": "Luxray", "type1": "Electric", "type2": None, "prev_evolution": "Luxio", "next_evolution": None, "hp": 80, "attack": 120, "defense": 79, "sp_attack": 95, "sp_defense": 79, "speed": 70},
-        {"name": "Garchomp", "type1": "Dragon", "type2": "Ground", "prev_evolution": "Gabite", "next_evolution": None, "hp": 108, "attack": 130, "defense": 95, "sp_attack": 80, "sp_defense": 85, "speed": 102},
-        {"name": "Lucario", "type1": "Fighting", "type2": "Steel", "prev_evolution": "Riolu", "next_evolution": None, "hp": 70, "attack": 110, "defense": 70, "sp_attack": 115, "sp_defense": 70, "speed": 90},
-        {"name": "Leafeon", "type1": "Grass", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 65, "attack": 110, "defense": 130, "sp_attack": 60, "sp_defense": 65, "speed": 95},
-        {"name": "Glaceon", "type1": "Ice", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 65, "attack": 60, "defense": 110, "sp_attack": 130, "sp_defense": 95, "speed": 65},
-        {"name": "Togekiss", "type1": "Fairy", "type2": "Flying", "prev_evolution": "Togetic", "next_evolution": None, "hp": 85, "attack": 50, "defense": 95, "sp_attack": 120, "sp_defense": 115, "speed": 80},
-        {"name": "Dialga", "type1": "Steel", "type2": "Dragon", "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 120, "defense": 120, "sp_attack": 150, "sp_defense": 100, "speed": 90},
-        {"name": "Palkia", "type1": "Water", "type2": "Dragon", "prev_evolution": None, "next_evolution": None, "hp": 90, "attack": 120, "defense": 100, "sp_attack": 150, "sp_defense": 120, "speed": 100},
-        {"name": "Giratina", "type1": "Ghost", "type2": "Dragon", "prev_evolution": None, "next_evolution": None, "hp": 150, "attack": 100, "defense": 120, "sp_attack": 100, "sp_defense": 120, "speed": 90},
-        {"name": "Arceus", "type1": "Normal", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 120, "attack": 120, "defense": 120, "sp_attack": 120, "sp_defense": 120, "speed": 120},
-        
-        # Gen 5 Pokemon
-        {"name": "Snivy", "type1": "Grass", "type2": None, "prev_evolution": None, "next_evolution": "Servine", "hp": 45, "attack": 45, "defense": 55, "sp_attack": 45, "sp_defense": 55, "speed": 63},
-        {"name": "Servine", "type1": "Grass", "type2": None, "prev_evolution": "Snivy", "next_evolution": "Serperior", "hp": 60, "attack": 60, "defense": 75, "sp_attack": 60, "sp_defense": 75, "speed": 83},
-        {"name": "Serperior", "type1": "Grass", "type2": None, "prev_evolution": "Servine", "next_evolution": None, "hp": 75, "attack": 75, "defense": 95, "sp_attack": 75, "sp_defense": 95, "speed": 113},
-        {"name": "Tepig", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Pignite", "hp": 65, "attack": 63, "defense": 45, "sp_attack": 45, "sp_defense": 45, "speed": 45},
-        {"name": "Pignite", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Tepig", "next_evolution": "Emboar", "hp": 90, "attack": 93, "defense": 55, "sp_attack": 70, "sp_defense": 55, "speed": 55},
-        {"name": "Emboar", "type1": "Fire", "type2": "Fighting", "prev_evolution": "Pignite", "next_evolution": None, "hp": 110, "attack": 123, "defense": 65, "sp_attack": 100, "sp_defense": 65, "speed": 65},
-        {"name": "Oshawott", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Dewott", "hp": 55, "attack": 55, "defense": 45, "sp_attack": 63, "sp_defense": 45, "speed": 45},
-        {"name": "Dewott", "type1": "Water", "type2": None, "prev_evolution": "Oshawott", "next_evolution": "Samurott", "hp": 75, "attack": 75, "defense": 60, "sp_attack": 83, "sp_defense": 60, "speed": 60},
-        {"name": "Samurott", "type1": "Water", "type2": None, "prev_evolution": "Dewott", "next_evolution": None, "hp": 95, "attack": 100, "defense": 85, "sp_attack": 108, "sp_defense": 70, "speed": 70},
-        {"name": "Zoroark", "type1": "Dark", "type2": None, "prev_evolution": "Zorua", "next_evolution": None, "hp": 60, "attack": 105, "defense": 60, "sp_attack": 120, "sp_defense": 60, "speed": 105},
-        {"name": "Hydreigon", "type1": "Dark", "type2": "Dragon", "prev_evolution": "Zweilous", "next_evolution": None, "hp": 92, "attack": 105, "defense": 90, "sp_attack": 125, "sp_defense": 90, "speed": 98},
-        {"name": "Reshiram", "type1": "Dragon", "type2": "Fire", "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 120, "defense": 100, "sp_attack": 150, "sp_defense": 120, "speed": 90},
-        {"name": "Zekrom", "type1": "Dragon", "type2": "Electric", "prev_evolution": None, "next_evolution": None, "hp": 100, "attack": 150, "defense": 120, "sp_attack": 120, "sp_defense": 100, "speed": 90},
-        {"name": "Kyurem", "type1": "Dragon", "type2": "Ice", "prev_evolution": None, "next_evolution": None, "hp": 125, "attack": 130, "defense": 90, "sp_attack": 130, "sp_defense": 90, "speed": 95},
-        
-        # Gen 6 Pokemon
-        {"name": "Chespin", "type1": "Grass", "type2": None, "prev_evolution": None, "next_evolution": "Quilladin", "hp": 56, "attack": 61, "defense": 65, "sp_attack": 48, "sp_defense": 45, "speed": 38},
-        {"name": "Quilladin", "type1": "Grass", "type2": None, "prev_evolution": "Chespin", "next_evolution": "Chesnaught", "hp": 61, "attack": 78, "defense": 95, "sp_attack": 56, "sp_defense": 58, "speed": 57},
-        {"name": "Chesnaught", "type1": "Grass", "type2": "Fighting", "prev_evolution": "Quilladin", "next_evolution": None, "hp": 88, "attack": 107, "defense": 122, "sp_attack": 74, "sp_defense": 75, "speed": 64},
-        {"name": "Fennekin", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Braixen", "hp": 40, "attack": 45, "defense": 40, "sp_attack": 62, "sp_defense": 60, "speed": 60},
-        {"name": "Braixen", "type1": "Fire", "type2": None, "prev_evolution": "Fennekin", "next_evolution": "Delphox", "hp": 59, "attack": 59, "defense": 58, "sp_attack": 90, "sp_defense": 70, "speed": 73},
-        {"name": "Delphox", "type1": "Fire", "type2": "Psychic", "prev_evolution": "Braixen", "next_evolution": None, "hp": 75, "attack": 69, "defense": 72, "sp_attack": 114, "sp_defense": 100, "speed": 104},
-        {"name": "Froakie", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Frogadier", "hp": 41, "attack": 56, "defense": 40, "sp_attack": 62, "sp_defense": 44, "speed": 71},
-        {"name": "Frogadier", "type1": "Water", "type2": None, "prev_evolution": "Froakie", "next_evolution": "Greninja", "hp": 54, "attack": 63, "defense": 52, "sp_attack": 83, "sp_defense": 56, "speed": 97},
-        {"name": "Greninja", "type1": "Water", "type2": "Dark", "prev_evolution": "Frogadier", "next_evolution": None, "hp": 72, "attack": 95, "defense": 67, "sp_attack": 103, "sp_defense": 71, "speed": 122},
-        {"name": "Sylveon", "type1": "Fairy", "type2": None, "prev_evolution": "Eevee", "next_evolution": None, "hp": 95, "attack": 65, "defense": 65, "sp_attack": 110, "sp_defense": 130, "speed": 60},
-        {"name": "Goodra", "type1": "Dragon", "type2": None, "prev_evolution": "Sliggoo", "next_evolution": None, "hp": 90, "attack": 100, "defense": 70, "sp_attack": 110, "sp_defense": 150, "speed": 80},
-        {"name": "Xerneas", "type1": "Fairy", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 126, "attack": 131, "defense": 95, "sp_attack": 131, "sp_defense": 98, "speed": 99},
-        {"name": "Yveltal", "type1": "Dark", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 126, "attack": 131, "defense": 95, "sp_attack": 131, "sp_defense": 98, "speed": 99},
-        
-        # Gen 7 Pokemon (Alola)
-        {"name": "Rowlet", "type1": "Grass", "type2": "Flying", "prev_evolution": None, "next_evolution": "Dartrix", "hp": 68, "attack": 55, "defense": 55, "sp_attack": 50, "sp_defense": 50, "speed": 42},
-        {"name": "Dartrix", "type1": "Grass", "type2": "Flying", "prev_evolution": "Rowlet", "next_evolution": "Decidueye", "hp": 78, "attack": 75, "defense": 75, "sp_attack": 70, "sp_defense": 70, "speed": 52},
-        {"name": "Decidueye", "type1": "Grass", "type2": "Ghost", "prev_evolution": "Dartrix", "next_evolution": None, "hp": 78, "attack": 107, "defense": 75, "sp_attack": 100, "sp_defense": 100, "speed": 70},
-        {"name": "Litten", "type1": "Fire", "type2": None, "prev_evolution": None, "next_evolution": "Torracat", "hp": 45, "attack": 65, "defense": 40, "sp_attack": 60, "sp_defense": 40, "speed": 70},
-        {"name": "Torracat", "type1": "Fire", "type2": None, "prev_evolution": "Litten", "next_evolution": "Incineroar", "hp": 65, "attack": 85, "defense": 50, "sp_attack": 80, "sp_defense": 50, "speed": 90},
-        {"name": "Incineroar", "type1": "Fire", "type2": "Dark", "prev_evolution": "Torracat", "next_evolution": None, "hp": 95, "attack": 115, "defense": 90, "sp_attack": 80, "sp_defense": 90, "speed": 60},
-        {"name": "Popplio", "type1": "Water", "type2": None, "prev_evolution": None, "next_evolution": "Brionne", "hp": 50, "attack": 54, "defense": 54, "sp_attack": 66, "sp_defense": 56, "speed": 40},
-        {"name": "Brionne", "type1": "Water", "type2": None, "prev_evolution": "Popplio", "next_evolution": "Primarina", "hp": 60, "attack": 69, "defense": 69, "sp_attack": 91, "sp_defense": 81, "speed": 50},
-        {"name": "Primarina", "type1": "Water", "type2": "Fairy", "prev_evolution": "Brionne", "next_evolution": None, "hp": 80, "attack": 74, "defense": 74, "sp_attack": 126, "sp_defense": 116, "speed": 60},
-        {"name": "Lycanroc", "type1": "Rock", "type2": None, "prev_evolution": "Rockruff", "next_evolution": None, "hp": 75, "attack": 115, "defense": 65, "sp_attack": 55, "sp_defense": 65, "speed": 112},
-        {"name": "Mimikyu", "type1": "Ghost", "type2": "Fairy", "prev_evolution": None, "next_evolution": None, "hp": 55, "attack": 90, "defense": 80, "sp_attack": 50, "sp_defense": 105, "speed": 96},
-        {"name": "Kommo-o", "type1": "Dragon", "type2": "Fighting", "prev_evolution": "Hakamo-o", "next_evolution": None, "hp": 75, "attack": 110, "defense": 125, "sp_attack": 100, "sp_defense": 105, "speed": 85},
-        {"name": "Solgaleo", "type1": "Psychic", "type2": "Steel", "prev_evolution": "Cosmoem", "next_evolution": None, "hp": 137, "attack": 137, "defense": 107, "sp_attack": 113, "sp_defense": 89, "speed": 97},
-        {"name": "Lunala", "type1": "Psychic", "type2": "Ghost", "prev_evolution": "Cosmoem", "next_evolution": None, "hp": 137, "attack": 113, "defense": 89, "sp_attack": 137, "sp_defense": 107, "speed": 97},
-        {"name": "Necrozma", "type1": "Psychic", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 97, "attack": 107, "defense": 101, "sp_attack": 127, "sp_defense": 89, "speed": 79},
-        
-        # Additional popular Pokemon
-        {"name": "Alakazam", "type1": "Psychic", "type2": None, "prev_evolution": "Kadabra", "next_evolution": None, "hp": 55, "attack": 50, "defense": 45, "sp_attack": 135, "sp_defense": 95, "speed": 120},
-        {"name": "Slowbro", "type1": "Water", "type2": "Psychic", "prev_evolution": "Slowpoke", "next_evolution": None, "hp": 95, "attack": 75, "defense": 110, "sp_attack": 100, "sp_defense": 80, "speed": 30},
-        {"name": "Lapras", "type1": "Water", "type2": "Ice", "prev_evolution": None, "next_evolution": None, "hp": 130, "attack": 85, "defense": 80, "sp_attack": 85, "sp_defense": 95, "speed": 60},
-        {"name": "Snorlax", "type1": "Normal", "type2": None, "prev_evolution": "Munchlax", "next_evolution": None, "hp": 160, "attack": 110, "defense": 65, "sp_attack": 65, "sp_defense": 110, "speed": 30},
-        {"name": "Articuno", "type1": "Ice", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 90, "attack": 85, "defense": 100, "sp_attack": 95, "sp_defense": 125, "speed": 85},
-        {"name": "Zapdos", "type1": "Electric", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 90, "attack": 90, "defense": 85, "sp_attack": 125, "sp_defense": 90, "speed": 100},
-        {"name": "Moltres", "type1": "Fire", "type2": "Flying", "prev_evolution": None, "next_evolution": None, "hp": 90, "attack": 100, "defense": 90, "sp_attack": 125, "sp_defense": 85, "speed": 90},
-        {"name": "Scizor", "type1": "Bug", "type2": "Steel", "prev_evolution": "Scyther", "next_evolution": None, "hp": 70, "attack": 130, "defense": 100, "sp_attack": 55, "sp_defense": 80, "speed": 65},
-        {"name": "Heracross", "type1": "Bug", "type2": "Fighting", "prev_evolution": None, "next_evolution": None, "hp": 80, "attack": 125, "defense": 75, "sp_attack": 40, "sp_defense": 95, "speed": 85},
-        {"name": "Kingdra", "type1": "Water", "type2": "Dragon", "prev_evolution": "Seadra", "next_evolution": None, "hp": 75, "attack": 95, "defense": 95, "sp_attack": 95, "sp_defense": 95, "speed": 85},
-        {"name": "Milotic", "type1": "Water", "type2": None, "prev_evolution": "Feebas", "next_evolution": None, "hp": 95, "attack": 60, "defense": 79, "sp_attack": 100, "sp_defense": 125, "speed": 81},
-        {"name": "Salamence", "type1": "Dragon", "type2": "Flying", "prev_evolution": "Shelgon", "next_evolution": None, "hp": 95, "attack": 135, "defense": 80, "sp_attack": 110, "sp_defense": 80, "speed": 100},
-        {"name": "Breloom", "type1": "Grass", "type2": "Fighting", "prev_evolution": "Shroomish", "next_evolution": None, "hp": 60, "attack": 130, "defense": 80, "sp_attack": 60, "sp_defense": 60, "speed": 70},
-        {"name": "Slaking", "type1": "Normal", "type2": None, "prev_evolution": "Vigoroth", "next_evolution": None, "hp": 150, "attack": 160, "defense": 100, "sp_attack": 95, "sp_defense": 65, "speed": 100},
-        {"name": "Absol", "type1": "Dark", "type2": None, "prev_evolution": None, "next_evolution": None, "hp": 65, "attack": 130, "defense": 60, "sp_attack": 75, "sp_defense": 60, "speed": 75},
-    ]
-    
-    # Create DataFrame
-    df = pd.DataFrame(pokemon_data)
+                      speed, total_stats. type1 and type2 are categoricals
+                      sharing TYPE_DTYPE.
+    """
+    if not dex_is_current(source_path, dex_path):
+        try:
+            build_dex(source_path, dex_path)
+        except OSError:
+            return read_pokemon_csv(source_path)
+    return load_dex(dex_path)
+
+
+def get_type_counts(df: pd.DataFrame) -> pd.Series:
+    """
+    Count Pokemon per type from the categorical codes, without a row scan.
     
-    # Calculate total stats
-    df['total_stats'] = df['hp'] + df['attack'] + df['defense'] + df['sp_attack'] + df['sp_defense'] + df['speed']
+    A Pokemon is counted once for each of its types.
     
-    return df
+    Args:
+        df: DataFrame as returned by get_pokemon_data()
+    
+    Returns:
+        pd.Series: Count per type, indexed by POKEMON_TYPES; types absent from
+                   the data are omitted
+    """
+    n_types = len(POKEMON_TYPES)
+    counts = np.zeros(n_types, dtype=np.int64)
+    for column in ('type1', 'type2'):
+        codes = df[column].cat.codes.to_numpy()
+        counts += np.bincount(codes[codes >= 0], minlength=n_types)
+    counts = pd.Series(counts, index=POKEMON_TYPES, name='count')
+    return counts[counts > 0]
+
+
+# Delta files: row-level changes layered over the base dataset
+
+DELTA_DIR = os.path.join(DATA_DIR, 'deltas')
+DELTA_COLUMNS = ['name', 'type1', 'type2', 'prev_evolution', 'next_evolution'] + STAT_COLUMNS
+DELTA_OPS = ('add', 'update', 'remove')
+
+
+def delta_version(base_version: str, delta_sha256: str) -> str:
+    """Version of the data after applying a delta file to base_version."""
+    return hashlib.sha256(f'{base_version}:{delta_sha256}'.encode('utf-8')).hexdigest()
+
+
+def read_delta(path: str) -> dict:
+    """
+    Read and validate a delta file.
+    
+    A delta is a JSON object with a list of changes, applied in order:
+    
+        {
+            "base_version": "<optional version this delta expects>",
+            "changes": [
+                {"op": "add", "row": {"name": "...", "type1": "...", "hp": 1, ...}},
+                {"op": "update", "name": "...", "values": {"speed": 100}},
+                {"op": "remove", "name": "..."}
+            ]
+        }
+    
+    Added rows need every column except total_stats, which is always derived;
+    type2 and the evolution columns may be null.
+    
+    Args:
+        path: Path of the delta file
+    
+    Returns:
+        dict: The delta with 'changes', 'base_version' (or None) and 'sha256',
+              the digest of the file
+    
+    Raises:
+        ValueError: If the file is not a well-formed delta
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    try:
+        delta = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}")
+    if not isinstance(delta, dict) or not isinstance(delta.get('changes'), list):
+        raise ValueError(f"{path} must be an object with a 'changes' list")
+    
+    for position, change in enumerate(delta['changes']):
+        where = f"{path}: change {position}"
+        if not isinstance(change, dict) or change.get('op') not in DELTA_OPS:
+            raise ValueError(f"{where} must have an op of {', '.join(DELTA_OPS)}")
+        if change['op'] == 'add':
+            row = change.get('row')
+            if not isinstance(row, dict):
+                raise ValueError(f"{where} needs a 'row' object")
+            missing = [column for column in DELTA_COLUMNS if column not in row]
+            if missing:
+                raise ValueError(f"{where} is missing {', '.join(missing)}")
+            _check_values(row, where)
+        else:
+            if not isinstance(change.get('name'), str):
+                raise ValueError(f"{where} needs a 'name'")
+            if change['op'] == 'update':
+                if not isinstance(change.get('values'), dict):
+                    raise ValueError(f"{where} needs a 'values' object")
+                _check_values(change['values'], where)
+    
+    return {
+        'base_version': delta.get('base_version'),
+        'changes': delta['changes'],
+        'sha256': hashlib.sha256(content).hexdigest(),
+    }
+
+
+def _check_values(values: dict, where: str) -> None:
+    """Validate column values of an added or updated row."""
+    for column, value in values.items():
+        if column not in DELTA_COLUMNS:
+            raise ValueError(f"{where}: unknown or derived column {column!r}")
+        if column in STAT_COLUMNS:
+            if not isinstance(value, int) or isinstance(value, bool) or not 1 <= value <= 255:
+                raise ValueError(f"{where}: {column} must be an integer from 1 to 255")
+        elif column in ('type1', 'type2'):
+            if value not in POKEMON_TYPES and not (column == 'type2' and value is None):
+                raise ValueError(f"{where}: unknown {column} {value!r}")
+        elif not isinstance(value, str) and not (column != 'name' and value is None):
+            raise ValueError(f"{where}: {column} must be a string")
+
+
+def list_deltas(delta_dir: str = DELTA_DIR) -> List[str]:
+    """Return the delta files in a directory, in the order they apply."""
+    try:
+        names = sorted(name for name in os.listdir(delta_dir) if name.endswith('.json'))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(delta_dir, name) for name in names]
+
+
+def apply_changes(df: pd.DataFrame,
+                  changes: Sequence[dict]) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Apply change records to a DataFrame, returning a new one.
+    
+    Surviving rows keep their relative order and added rows are appended,
+    so species ids shift down only past removed rows. total_stats is
+    recomputed for added and updated rows only.
+    
+    Args:
+        df: DataFrame as returned by get_pokemon_data()
+        changes: Change records as described in read_delta()
+    
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray, np.ndarray]: The new DataFrame, a
+            boolean mask of the old rows that were kept, and the sorted new
+            ids of added or updated rows
+    
+    Raises:
+        ValueError: If a change refers to a missing name or adds a duplicate
+    """
+    rows = {name: row for row, name in enumerate(df['name'].tolist())}
+    keep = np.ones(len(df), dtype=bool)
+    updates: Dict[int, dict] = {}
+    added: Dict[str, dict] = {}
+    
+    for change in changes:
+        op = change['op']
+        name = change['row']['name'] if op == 'add' else change['name']
+        if op == 'add':
+            if name in rows or name in added:
+                raise ValueError(f"Cannot add {name!r}: it already exists")
+            added[name] = dict(change['row'])
+            continue
+        if name not in rows and name not in added:
+            raise ValueError(f"Cannot {op} {name!r}: no such Pokemon")
+        values = change.get('values', {})
+        if values.get('name', name) != name and (values['name'] in rows or values['name'] in added):
+            raise ValueError(f"Cannot rename {name!r} to {values['name']!r}: it already exists")
+        
+        if name in added:
+            row = added.pop(name)
+            if op == 'update':
+                row.update(values)
+                added[row['name']] = row
+        else:
+            row_id = rows.pop(name)
+            if op == 'remove':
+                keep[row_id] = False
+                updates.pop(row_id, None)
+            else:
+                updates.setdefault(row_id, {}).update(values)
+                rows[values.get('name', name)] = row_id
+    
+    # Positions in the new frame: kept rows first, then additions
+    new_ids = np.cumsum(keep) - 1
+    n_kept = int(keep.sum())
+    updated_ids = np.array(sorted(new_ids[row_id] for row_id in updates), dtype=np.intp)
+    changed = np.concatenate([updated_ids, np.arange(n_kept, n_kept + len(added))])
+    
+    kept = df.iloc[np.flatnonzero(keep)]
+    columns = {}
+    for column in DELTA_COLUMNS:
+        series = kept[column]
+        if column in STAT_COLUMNS:
+            values = series.to_numpy(dtype=np.int16, copy=True)
+        else:
+            values = series.astype(object).where(series.notna(), None).to_numpy(copy=True)
+        for row_id, patch in updates.items():
+            if column in patch:
+                values[new_ids[row_id]] = patch[column]
+        extra = np.array([row[column] for row in added.values()], dtype=values.dtype)
+        columns[column] = np.concatenate([values, extra])
+    
+    result = pd.DataFrame(columns)
+    result['type1'] = pd.Categorical(columns['type1'], dtype=TYPE_DTYPE)
+    result['type2'] = pd.Categorical(columns['type2'], dtype=TYPE_DTYPE)
+    
+    # Only changed rows need their total recomputed
+    total_stats = np.concatenate([
+        kept['total_stats'].to_numpy(dtype=np.int16), np.zeros(len(added), dtype=np.int16)
+    ])
+    total_stats[changed] = np.stack([columns[column][changed] for column in STAT_COLUMNS]).sum(axis=0)
+    result['total_stats'] = total_stats
+    
+    result.attrs['version'] = df.attrs.get('version', '')
+    return result, keep, changed
+
+
+class EvolutionGraph:
+    """
+    Adjacency-list evolution graph keyed by integer species id.
+    
+    Species ids are row positions in the DataFrame. Edges come from both
+    prev_evolution and next_evolution, so branching lines such as Eevee get
+    every child even though next_evolution only names one of them. Family
+    ids, stage depth and the members of every family are precomputed, so
+    all lookups are array indexing.
+    
+    Stages are counted within the loaded data; a pre-evolution that is
+    referenced but not present counts as one stage below its child.
+    """
+    
+    def __init__(self, df: pd.DataFrame):
+        names = df['name'].to_numpy()
+        self.size = len(names)
+        species_ids = {name: species_id for species_id, name in enumerate(names)}
+        
+        # Parent pointers from prev_evolution, filled in from next_evolution
+        # where a child names no pre-evolution of its own
+        self.parent = np.full(self.size, -1, dtype=np.int32)
+        missing_parent = np.zeros(self.size, dtype=bool)
+        for species_id, prev_name in enumerate(df['prev_evolution'].to_numpy()):
+            if pd.isna(prev_name):
+                continue
+            if prev_name in species_ids:
+                self.parent[species_id] = species_ids[prev_name]
+            else:
+                missing_parent[species_id] = True
+        for species_id, next_name in enumerate(df['next_evolution'].to_numpy()):
+            child = species_ids.get(next_name) if pd.notna(next_name) else None
+            if child is not None and self.parent[child] == -1:
+                self.parent[child] = species_id
+                missing_parent[child] = False
+        
+        children: List[List[int]] = [[] for _ in range(self.size)]
+        for species_id, parent in enumerate(self.parent):
+            if parent >= 0:
+                children[parent].append(species_id)
+        
+        # Walk each family from its root to assign family ids and stages;
+        # anything left unvisited sits on a cycle and becomes its own root
+        self.family_id = np.full(self.size, -1, dtype=np.int32)
+        self.stage = np.zeros(self.size, dtype=np.int8)
+        families: List[List[int]] = []
+        roots = [species_id for species_id in range(self.size) if self.parent[species_id] == -1]
+        for root in roots + list(range(self.size)):
+            if self.family_id[root] >= 0:
+                continue
+            family = len(families)
+            members = []
+            stack = [(root, 2 if missing_parent[root] else 1)]
+            while stack:
+                species_id, stage = stack.pop()
+                if self.family_id[species_id] >= 0:
+                    continue
+                self.family_id[species_id] = family
+                self.stage[species_id] = stage
+                members.append(species_id)
+                stack.extend((child, stage + 1) for child in children[species_id])
+            families.append(members)
+        
+        # Family members ordered by stage, then dex order
+        self.family_members: List[np.ndarray] = []
+        for members in families:
+            members = np.array(sorted(members, key=lambda m: (self.stage[m], m)), dtype=np.int32)
+            self.family_members.append(members)
+        
+        self._set_stages()
+    
+    def _set_stages(self) -> None:
+        self.stages: List[int] = sorted(int(stage) for stage in np.unique(self.stage))
+        self.stage_masks: Dict[int, np.ndarray] = {
+            stage: self.stage == stage for stage in self.stages
+        }
+    
+    @functools.cached_property
+    def children(self) -> List[np.ndarray]:
+        """Child ids of every species, in dex order."""
+        has_parent = np.flatnonzero(self.parent >= 0)
+        order = has_parent[np.argsort(self.parent[has_parent], kind='stable')].astype(np.int32)
+        counts = np.bincount(self.parent[has_parent], minlength=self.size)
+        return np.split(order, np.cumsum(counts)[:-1])
+    
+    def updated(self, old_df: pd.DataFrame, df: pd.DataFrame, keep: np.ndarray,
+                changed: np.ndarray) -> 'EvolutionGraph':
+        """
+        Return the graph for a changed DataFrame, patching this one.
+        
+        Only families a change can reach are rebuilt: the old families of
+        removed and changed rows, rows referencing a name that appeared or
+        disappeared, and everything linked to those by family or by a
+        prev/next reference, until closed. Every other family keeps its
+        parents and stages, renumbered past removed rows.
+        
+        Args:
+            old_df: DataFrame this graph was built from
+            df: The changed DataFrame, as returned by apply_changes()
+            keep: Boolean mask of the old rows that were kept
+            changed: Sorted new ids of added or updated rows
+        
+        Returns:
+            EvolutionGraph: Same structure as EvolutionGraph(df)
+        """
+        size = len(df)
+        kept_ids = np.flatnonzero(keep)
+        n_kept = len(kept_ids)
+        new_ids = np.full(self.size, -1, dtype=np.int32)
+        new_ids[kept_ids] = np.arange(n_kept)
+        updated_old = kept_ids[changed[changed < n_kept]]
+        
+        # Every name reference as a row id (-1 if the name is not loaded)
+        names = pd.Index(df['name'].to_numpy(dtype=object))
+        prev_ids = names.get_indexer(df['prev_evolution'].to_numpy(dtype=object))
+        next_ids = names.get_indexer(df['next_evolution'].to_numpy(dtype=object))
+        
+        # Names that appeared or disappeared, and the rows referencing them
+        old_names = old_df['name'].to_numpy(dtype=object)
+        new_names = df['name'].to_numpy(dtype=object)
+        changed_names = pd.Index(np.concatenate([
+            old_names[~keep], old_names[updated_old], new_names[changed]
+        ])).unique()
+        affected = np.zeros(size, dtype=bool)
+        affected[changed] = True
+        for column in ('prev_evolution', 'next_evolution'):
+            affected |= changed_names.get_indexer(df[column].to_numpy(dtype=object)) >= 0
+        
+        # Close the affected set over old families and references both ways
+        old_family = self.family_id[kept_ids]
+        family_hit = np.zeros(len(self.family_members), dtype=bool)
+        family_hit[self.family_id[~keep]] = True
+        family_hit[self.family_id[updated_old]] = True
+        while True:
+            family_hit[old_family[affected[:n_kept]]] = True
+            affected[:n_kept] |= family_hit[old_family]
+            padded = np.append(affected, False)
+            grown = affected | padded[prev_ids] | padded[next_ids]
+            references = np.concatenate([prev_ids[affected], next_ids[affected]])
+            grown[references[references >= 0]] = True
+            if grown.sum() == affected.sum():
+                break
+            affected = grown
+        
+        graph = EvolutionGraph.__new__(EvolutionGraph)
+        graph.size = size
+        graph.parent = np.full(size, -1, dtype=np.int32)
+        graph.family_id = np.empty(size, dtype=np.int32)
+        graph.stage = np.empty(size, dtype=np.int8)
+        
+        # Untouched families: renumber ids, keep structure and stages
+        untouched = np.flatnonzero(~affected)
+        old_ids = kept_ids[untouched]
+        parents = self.parent[old_ids]
+        graph.parent[untouched] = np.where(parents >= 0, new_ids[parents], -1)
+        graph.stage[untouched] = self.stage[old_ids]
+        retained = np.flatnonzero(~family_hit)
+        family_ids = np.full(len(self.family_members), -1, dtype=np.int32)
+        family_ids[retained] = np.arange(len(retained))
+        graph.family_id[untouched] = family_ids[self.family_id[old_ids]]
+        if n_kept == self.size:
+            graph.family_members = [self.family_members[family] for family in retained]
+        else:
+            graph.family_members = [new_ids[self.family_members[family]] for family in retained]
+        
+        # Affected families: rebuilt from their rows alone, then mapped back
+        rebuilt_ids = np.flatnonzero(affected).astype(np.int32)
+        if len(rebuilt_ids):
+            rebuilt = EvolutionGraph(df.iloc[rebuilt_ids])
+            graph.parent[rebuilt_ids] = np.where(rebuilt.parent >= 0, rebuilt_ids[rebuilt.parent], -1)
+            graph.stage[rebuilt_ids] = rebuilt.stage
+            graph.family_id[rebuilt_ids] = len(retained) + rebuilt.family_id
+            graph.family_members.extend(rebuilt_ids[members] for members in rebuilt.family_members)
+        
+        graph._set_stages()
+        return graph
+    
+    def family(self, species_id: int) -> np.ndarray:
+        """Return every member of the species' evolution family, by stage."""
+        return self.family_members[self.family_id[species_id]]
+    
+    def family_mask(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Expand a set of species to their whole evolution families.
+        
+        Args:
+            rows: Species ids to expand
+        
+        Returns:
+            np.ndarray: Boolean mask over all species
+        """
+        families = np.zeros(len(self.family_members), dtype=bool)
+        families[self.family_id[rows]] = True
+        return families[self.family_id]
+
+
+class NameSearchIndex:
+    """
+    Prefix and typo-tolerant name search built once over the name column.
+    
+    Names are normalized to lowercase alphanumerics ("Mr. Mime" -> "mrmime").
+    Prefix matches come from binary search over the sorted normalized names;
+    typo tolerance comes from a trigram inverted index scored by Jaccard
+    similarity. Both are combined into one relevance score per species.
+    """
+    
+    PREFIX_BONUS = 1.0
+    EXACT_BONUS = 1.0
+    MIN_SIMILARITY = 0.25
+    
+    def __init__(self, names: Sequence[str]):
+        self.size = len(names)
+        keys = [self.normalize(name) for name in names]
+        
+        # Sorted prefix array
+        order = sorted(range(self.size), key=lambda species_id: keys[species_id])
+        self.sorted_keys: List[str] = [keys[species_id] for species_id in order]
+        self.sorted_ids = np.array(order, dtype=np.int32)
+        self.keys = np.array(keys, dtype=object)
+        
+        # Trigram inverted index
+        postings: Dict[str, List[int]] = {}
+        self.trigram_counts = np.zeros(self.size, dtype=np.float32)
+        for species_id, key in enumerate(keys):
+            trigrams = self.trigrams(key)
+            self.trigram_counts[species_id] = len(trigrams)
+            for trigram in trigrams:
+                postings.setdefault(trigram, []).append(species_id)
+        self.postings: Dict[str, np.ndarray] = {
+            trigram: np.array(ids, dtype=np.int32) for trigram, ids in postings.items()
+        }
+    
+    def updated(self, names: Sequence[str], keep: np.ndarray,
+                changed: np.ndarray) -> 'NameSearchIndex':
+        """
+        Return the index for a changed name column, patching this one.
+        
+        Entries of removed and changed species are dropped and the rest
+        renumbered; changed species are then inserted into the sorted prefix
+        array by binary search and into the postings of their trigrams.
+        
+        Args:
+            names: The new name column
+            keep: Boolean mask of the old species that were kept
+            changed: Sorted new ids of added or updated species
+        
+        Returns:
+            NameSearchIndex: Same structure as NameSearchIndex(names)
+        """
+        index = NameSearchIndex.__new__(NameSearchIndex)
+        index.size = len(names)
+        kept_ids = np.flatnonzero(keep)
+        n_kept = len(kept_ids)
+        stale_ids = kept_ids[changed[changed < n_kept]]
+        new_ids = np.full(self.size, -1, dtype=np.int32)
+        new_ids[kept_ids] = np.arange(n_kept)
+        new_ids[stale_ids] = -1
+        
+        changed_keys = [self.normalize(names[species_id]) for species_id in changed]
+        changed_trigrams = [self.trigrams(key) for key in changed_keys]
+        index.keys = np.empty(index.size, dtype=object)
+        index.keys[:n_kept] = self.keys[keep]
+        index.trigram_counts = np.zeros(index.size, dtype=np.float32)
+        index.trigram_counts[:n_kept] = self.trigram_counts[keep]
+        for species_id, key, trigrams in zip(changed, changed_keys, changed_trigrams):
+            index.keys[species_id] = key
+            index.trigram_counts[species_id] = len(trigrams)
+        
+        # Sorted prefix array; equal keys stay in id order, as after a stable sort
+        survivors = new_ids[self.sorted_ids]
+        valid = survivors >= 0
+        base_keys = [key for key, ok in zip(self.sorted_keys, valid) if ok]
+        base_ids = survivors[valid]
+        inserts = sorted(zip(changed_keys, changed.tolist()))
+        positions = []
+        for key, species_id in inserts:
+            position = bisect.bisect_left(base_keys, key)
+            while position < len(base_keys) and base_keys[position] == key \
+                    and base_ids[position] < species_id:
+                position += 1
+            positions.append(position)
+        index.sorted_keys = np.insert(
+            np.array(base_keys, dtype=object), positions, [key for key, _ in inserts]
+        ).tolist()
+        index.sorted_ids = np.insert(
+            base_ids, positions, [species_id for _, species_id in inserts]
+        ).astype(np.int32)
+        
+        # Postings: renumber every list when ids shifted, otherwise only the
+        # lists that held a changed species
+        if n_kept < self.size:
+            stale_trigrams = self.postings.keys()
+        else:
+            stale_trigrams = set().union(*(self.trigrams(key) for key in self.keys[stale_ids]))
+        index.postings = dict(self.postings)
+        for trigram in stale_trigrams:
+            ids = new_ids[self.postings[trigram]]
+            index.postings[trigram] = ids[ids >= 0]
+        additions: Dict[str, List[int]] = {}
+        for species_id, trigrams in zip(changed.tolist(), changed_trigrams):
+            for trigram in trigrams:
+                additions.setdefault(trigram, []).append(species_id)
+        for trigram, ids in additions.items():
+            existing = index.postings.get(trigram, np.empty(0, dtype=np.int32))
+            index.postings[trigram] = np.sort(np.concatenate([existing, ids])).astype(np.int32)
+        index.postings = {trigram: ids for trigram, ids in index.postings.items() if len(ids)}
+        return index
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lowercase a name and drop everything but letters and digits."""
+        return ''.join(char for char in name.lower() if char.isalnum())
+    
+    @staticmethod
+    def trigrams(key: str) -> set:
+        """Return the set of padded trigrams of a normalized key."""
+        padded = f"$${key}$"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def prefix_ids(self, key: str) -> np.ndarray:
+        """Return the ids of names starting with a normalized key."""
+        start = bisect.bisect_left(self.sorted_keys, key)
+        end = bisect.bisect_left(self.sorted_keys, key + '￿', lo=start)
+        return self.sorted_ids[start:end]
+    
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Score every species against a query.
+        
+        Returns:
+            np.ndarray: float32 relevance per species; 0 means no match
+        """
+        key = self.normalize(query)
+        scores = np.zeros(self.size, dtype=np.float32)
+        if not key:
+            return scores
+        
+        # Jaccard similarity of trigram sets
+        query_trigrams = self.trigrams(key)
+        shared = np.zeros(self.size, dtype=np.float32)
+        for trigram in query_trigrams:
+            posting = self.postings.get(trigram)
+            if posting is not None:
+                shared[posting] += 1
+        similarity = shared / (self.trigram_counts + len(query_trigrams) - shared)
+        scores[similarity >= self.MIN_SIMILARITY] = similarity[similarity >= self.MIN_SIMILARITY]
+        
+        prefix_ids = self.prefix_ids(key)
+        scores[prefix_ids] += self.PREFIX_BONUS
+        scores[prefix_ids[self.keys[prefix_ids] == key]] += self.EXACT_BONUS
+        return scores
+    
+    def search(self, query: str, k: int = 10, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return the ids of the k best matches for a query, best first.
+        
+        Args:
+            query: Partial or misspelled name
+            k: Maximum number of results
+            mask: Optional boolean mask restricting the candidates
+        
+        Returns:
+            np.ndarray: Species ids ordered by relevance, then dex order
+        """
+        scores = self.scores(query)
+        if mask is not None:
+            scores[~mask] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return self.rank(candidates, scores)
+    
+    @staticmethod
+    def rank(ids: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Order ids by descending score, breaking ties by dex order."""
+        return ids[np.lexsort((ids, -scores[ids]))]
+
+
+class SimilarityIndex:
+    """
+    Nearest neighbours by base-stat profile.
+    
+    Each species' six base stats are z-scored per stat into a float32
+    matrix. The k nearest neighbours of every species are computed once, in
+    batched chunks of squared Euclidean distances, so an unrestricted lookup
+    is a row read from the precomputed table.
+    """
+    
+    TABLE_SIZE = 20
+    CHUNK_ELEMENTS = 1 << 22
+    
+    def __init__(self, df: pd.DataFrame, table_size: int = TABLE_SIZE):
+        stats = df[STAT_COLUMNS].to_numpy(dtype=np.float32)
+        self.size = len(stats)
+        mean = stats.mean(axis=0) if self.size else np.zeros(len(STAT_COLUMNS), dtype=np.float32)
+        std = stats.std(axis=0) if self.size else np.ones(len(STAT_COLUMNS), dtype=np.float32)
+        std[std == 0] = 1
+        self.vectors = ((stats - mean) / std).astype(np.float32)
+        self.squared_norms = (self.vectors ** 2).sum(axis=1)
+        
+        # All-pairs top-k table, excluding each species itself
+        self.table_size = min(table_size, max(self.size - 1, 0))
+        self.neighbors = np.zeros((self.size, self.table_size), dtype=np.int32)
+        self.distances = np.zeros((self.size, self.table_size), dtype=np.float32)
+        if self.table_size == 0:
+            return
+        # Chunks are sized so each distance block stays around 16 MB
+        chunk_size = max(1, self.CHUNK_ELEMENTS // self.size)
+        for start in range(0, self.size, chunk_size):
+            chunk = np.arange(start, min(start + chunk_size, self.size))
+            squared = self._squared_distances(chunk)
+            squared[np.arange(len(chunk)), chunk] = np.inf
+            nearest = np.argpartition(squared, self.table_size - 1, axis=1)[:, :self.table_size]
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.lexsort((nearest, nearest_squared), axis=1)
+            self.neighbors[chunk] = np.take_along_axis(nearest, order, axis=1)
+            self.distances[chunk] = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+    
+    def _squared_distances(self, rows: np.ndarray,
+                           candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Squared distances from each of rows to each candidate (default all)."""
+        if candidates is None:
+            candidates = np.arange(self.size)
+        squared = (
+            self.squared_norms[rows, None]
+            + self.squared_norms[None, candidates]
+            - 2 * self.vectors[rows] @ self.vectors[candidates].T
+        )
+        return np.maximum(squared, 0)
+    
+    def similar(self, species_id: int, k: int = 10,
+                mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k species with the closest stat profile.
+        
+        Served from the precomputed table when it holds enough neighbours
+        passing the mask; otherwise distances to the masked species are
+        computed directly.
+        
+        Args:
+            species_id: Species to compare against
+            k: Number of neighbours
+            mask: Optional boolean mask restricting the candidates
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Neighbour ids and their distances,
+                                           closest first
+        """
+        neighbors = self.neighbors[species_id]
+        distances = self.distances[species_id]
+        if mask is not None:
+            keep = mask[neighbors]
+            neighbors = neighbors[keep]
+            distances = distances[keep]
+        if len(neighbors) >= k:
+            return neighbors[:k], distances[:k]
+        
+        candidates = np.arange(self.size) if mask is None else np.flatnonzero(mask)
+        candidates = candidates[candidates != species_id]
+        squared = self._squared_distances(np.array([species_id]), candidates)[0]
+        order = np.lexsort((candidates, squared))[:k]
+        return candidates[order], np.sqrt(squared[order])
+
+
+@dataclass(frozen=True)
+class PokemonQuery:
+    """
+    Normalized, hashable description of a filter/sort query.
+    
+    Build instances with PokemonQuery.create(), which validates the fields and
+    puts them in canonical form, so equivalent queries compare equal and share
+    one entry in the PokemonIndex query cache.
+    """
+    types: Tuple[str, ...] = ()
+    final_only: bool = False
+    whole_family: bool = False
+    stage: Optional[int] = None
+    name: Optional[str] = None
+    stat_ranges: Tuple[Tuple[str, int, int], ...] = ()
+    sort_keys: Tuple[Tuple[str, bool], ...] = ()
+    
+    @classmethod
+    def create(cls, types: Optional[Sequence[str]] = None, final_only: bool = False,
+               whole_family: bool = False, stage: Optional[int] = None,
+               name: Optional[str] = None,
+               stat_ranges: Optional[Dict[str, Tuple[int, int]]] = None,
+               sort_keys: Sequence[Tuple[str, bool]] = ()) -> 'PokemonQuery':
+        """
+        Validate and normalize query arguments (see PokemonIndex.query).
+        
+        Raises:
+            ValueError: On an unknown type, column or an empty stat range
+        """
+        types = tuple(sorted(set(types or ())))
+        for type_name in types:
+            if type_name not in POKEMON_TYPES:
+                raise ValueError(f"Unknown type: {type_name!r}")
+        
+        ranges = []
+        for column, (low, high) in sorted((stat_ranges or {}).items()):
+            if column not in SORT_COLUMNS:
+                raise ValueError(f"Unknown stat column: {column!r}")
+            if low > high:
+                raise ValueError(f"Empty range for {column}: {low} > {high}")
+            ranges.append((column, int(low), int(high)))
+        
+        keys = []
+        for column, ascending in sort_keys:
+            if column not in SORT_COLUMNS:
+                raise ValueError(f"Unknown sort column: {column!r}")
+            if column not in (key[0] for key in keys):
+                keys.append((column, bool(ascending)))
+        
+        return cls(
+            types=types,
+            final_only=bool(final_only),
+            whole_family=bool(whole_family),
+            stage=None if stage is None else int(stage),
+            name=NameSearchIndex.normalize(name) or None if name else None,
+            stat_ranges=tuple(ranges),
+            sort_keys=tuple(keys),
+        )
+    
+    def to_dict(self) -> dict:
+        """Return the query as JSON-compatible keyword arguments for create()."""
+        return {
+            'types': list(self.types),
+            'final_only': self.final_only,
+            'whole_family': self.whole_family,
+            'stage': self.stage,
+            'name': self.name,
+            'stat_ranges': {column: [low, high] for column, low, high in self.stat_ranges},
+            'sort_keys': [[column, ascending] for column, ascending in self.sort_keys],
+        }
+
+
+def parse_query_params(index: 'PokemonIndex', types: Optional[Sequence[str]] = None,
+                       final_only: bool = False, whole_family: bool = False,
+                       stage: Optional[int] = None, name: Optional[str] = None,
+                       stat_ranges: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+                       sort: str = '') -> PokemonQuery:
+    """
+    Build a PokemonQuery from external input, as taken by the query server
+    and batch export.
+    
+    A missing (None) range bound is completed with the column's min/max, so
+    a one-sided range shares a cache entry with its explicit form; a bound
+    beyond the data widens the completion instead, giving an empty result
+    rather than an empty-range error. sort is a
+    comma-separated list of columns, each prefixed with '-' for descending,
+    e.g. '-speed,-attack'.
+    
+    Args:
+        index: Index whose stat bounds complete open ranges
+        stat_ranges: Column -> (low, high), either bound may be None
+        sort: Sort columns in the syntax above
+        Other arguments: As for PokemonQuery.create()
+    
+    Raises:
+        ValueError: On an unknown column or invalid query values
+    """
+    ranges = {}
+    for column, (low, high) in (stat_ranges or {}).items():
+        if column not in SORT_COLUMNS:
+            raise ValueError(f"Unknown stat column: {column!r}")
+        # Open bounds never make a range empty, so a one-sided bound beyond
+        # the data matches nothing instead of failing
+        min_value, max_value = index.stat_bounds(column)
+        if high is None:
+            high = max_value if low is None else max(max_value, low)
+        if low is None:
+            low = min(min_value, high)
+        ranges[column] = (low, high)
+    
+    sort_keys = []
+    for key in sort.split(','):
+        key = key.strip()
+        if key:
+            sort_keys.append((key.lstrip('-'), not key.startswith('-')))
+    
+    return PokemonQuery.create(
+        types=types,
+        final_only=final_only,
+        whole_family=whole_family,
+        stage=stage,
+        name=name,
+        stat_ranges=ranges,
+        sort_keys=sort_keys,
+    )
+
+
+class PokemonIndex:
+    """
+    Precomputed query engine over the Pokemon DataFrame.
+    
+    Everything a sidebar query needs is derived once at construction time:
+    a boolean bitmap and sorted row-id array per type, a final-evolution mask,
+    the evolution graph, the name search index, and presorted permutations
+    and sorted values for total_stats and each base stat. A query is then
+    answered by OR-ing/AND-ing bitmaps, binary-searching the sorted values
+    for stat ranges and slicing a permutation, without copying or re-sorting
+    the DataFrame. The stat similarity index costs O(n^2) to build, so it is
+    built on first use instead. apply_delta() derives an updated index
+    without rebuilding these from scratch.
+    
+    Row ids are positions in the underlying DataFrame. Results of run() and
+    summarize() are kept in LRU caches keyed by the normalized PokemonQuery,
+    shared by every caller in the process.
+    """
+    
+    QUERY_CACHE_SIZE = 1024
+    
+    def __init__(self, df: pd.DataFrame):
+        self._set_frame(df)
+        
+        # Type vocabulary with per-type counts
+        self._set_type_counts(
+            get_type_counts(df).reindex(POKEMON_TYPES, fill_value=0).to_numpy()
+        )
+        
+        # Per-type bitmaps and row-id sets, built from the categorical codes
+        codes1 = df['type1'].cat.codes.to_numpy()
+        codes2 = df['type2'].cat.codes.to_numpy()
+        self.type_masks: Dict[str, np.ndarray] = {}
+        for type_name in self.types:
+            code = TYPE_DTYPE.categories.get_loc(type_name)
+            self.type_masks[type_name] = (codes1 == code) | (codes2 == code)
+        self._set_type_rows()
+        
+        # Final evolution mask
+        self.final_mask = df['next_evolution'].isna().to_numpy()
+        
+        # Presorted permutations; the descending order is a stable sort on the
+        # negated column so ties keep their dex order in both directions.
+        # sorted_values backs the binary searches for stat ranges.
+        self.ascending_orders: Dict[str, np.ndarray] = {}
+        self.descending_orders: Dict[str, np.ndarray] = {}
+        for column, values in self.columns.items():
+            self.ascending_orders[column] = np.argsort(values, kind='stable')
+            self.descending_orders[column] = np.argsort(-values, kind='stable')
+        self._set_sorted_values()
+        
+        # Evolution graph and name search indexes
+        self.evolutions = EvolutionGraph(df)
+        self.names = NameSearchIndex(df['name'].to_numpy())
+    
+    def _set_frame(self, df: pd.DataFrame) -> None:
+        """Attach a DataFrame and start with empty query caches."""
+        self.df = df
+        self.size = len(df)
+        self.version: str = df.attrs.get('version', '')
+        self.columns: Dict[str, np.ndarray] = {
+            column: df[column].to_numpy() for column in SORT_COLUMNS
+        }
+        self._cached_run = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._run)
+        self._cached_summary = functools.lru_cache(maxsize=self.QUERY_CACHE_SIZE)(self._summarize)
+    
+    def _set_type_counts(self, code_counts: np.ndarray) -> None:
+        """Set the type vocabulary from per-code counts over POKEMON_TYPES."""
+        self.type_code_counts = code_counts
+        counts = pd.Series(code_counts, index=POKEMON_TYPES, name='count')
+        self.type_counts = counts[counts > 0]
+        self.types: List[str] = list(self.type_counts.index)
+    
+    def _set_type_rows(self) -> None:
+        self.type_rows: Dict[str, np.ndarray] = {
+            type_name: np.flatnonzero(mask) for type_name, mask in self.type_masks.items()
+        }
+    
+    def _set_sorted_values(self) -> None:
+        self.sorted_values: Dict[str, np.ndarray] = {
+            column: values[self.ascending_orders[column]]
+            for column, values in self.columns.items()
+        }
+    
+    @functools.cached_property
+    def similarity(self) -> SimilarityIndex:
+        """Stat similarity index, built on first use."""
+        return SimilarityIndex(self.df)
+    
+    def apply_delta(self, changes: Sequence[dict], version: str) -> 'PokemonIndex':
+        """
+        Return a new index with a delta applied, updating derived data
+        incrementally.
+        
+        This index is left untouched, so readers holding it are unaffected.
+        Type counts, type bitmaps, the final-evolution mask, total_stats and
+        the presorted permutations are patched for the changed rows only:
+        removed ids are dropped and renumbered, and added or updated rows are
+        merged into each permutation with a binary search instead of a
+        re-sort. The evolution graph and name index are shared when no row
+        moved and the delta left their columns alone (e.g. a stat
+        correction), and otherwise patched for the affected species only
+        (see EvolutionGraph.updated and NameSearchIndex.updated). The
+        similarity index is shared under the same condition for the stat
+        columns; otherwise it is rebuilt on first use, since every z-score
+        shifts.
+        
+        Args:
+            changes: Change records as accepted by apply_changes()
+            version: Data version of the result
+        
+        Returns:
+            PokemonIndex: Index over the updated data
+        """
+        df, keep, changed = apply_changes(self.df, changes)
+        df.attrs['version'] = version
+        
+        index = PokemonIndex.__new__(PokemonIndex)
+        index._set_frame(df)
+        
+        kept_ids = np.flatnonzero(keep)
+        n_kept = len(kept_ids)
+        new_ids = np.full(self.size, -1, dtype=np.intp)
+        new_ids[kept_ids] = np.arange(n_kept)
+        changed_mask = np.zeros(index.size, dtype=bool)
+        changed_mask[changed] = True
+        
+        # Rows whose old values go away: removed rows plus the previous
+        # version of updated rows
+        updated_old = kept_ids[changed[changed < n_kept]]
+        outgoing = np.concatenate([np.flatnonzero(~keep), updated_old])
+        
+        # Type counts
+        n_types = len(POKEMON_TYPES)
+        old_codes = [self.df[column].cat.codes.to_numpy() for column in ('type1', 'type2')]
+        new_codes = [df[column].cat.codes.to_numpy() for column in ('type1', 'type2')]
+        code_counts = self.type_code_counts.copy()
+        for old, new in zip(old_codes, new_codes):
+            codes = old[outgoing]
+            code_counts -= np.bincount(codes[codes >= 0], minlength=n_types)
+            codes = new[changed]
+            code_counts += np.bincount(codes[codes >= 0], minlength=n_types)
+        index._set_type_counts(code_counts)
+        
+        # Bitmaps: carry kept rows over, then recompute the changed rows
+        def carry(mask: np.ndarray) -> np.ndarray:
+            carried = np.zeros(index.size, dtype=bool)
+            carried[:n_kept] = mask[keep]
+            return carried
+        
+        index.type_masks = {}
+        for type_name in index.types:
+            code = TYPE_DTYPE.categories.get_loc(type_name)
+            old_mask = self.type_masks.get(type_name)
+            mask = carry(old_mask) if old_mask is not None else np.zeros(index.size, dtype=bool)
+            mask[changed] = (new_codes[0][changed] == code) | (new_codes[1][changed] == code)
+            index.type_masks[type_name] = mask
+        index._set_type_rows()
+        
+        index.final_mask = carry(self.final_mask)
+        index.final_mask[changed] = df['next_evolution'].iloc[changed].isna().to_numpy()
+        
+        # Permutations: renumber, drop changed rows, then merge them back in
+        # at their binary-searched positions. Keys pair each value with its
+        # row id so ties keep dex order, as in the stable argsort.
+        index.ascending_orders = {}
+        index.descending_orders = {}
+        id_range = index.size + 1
+        changed_ids = np.flatnonzero(changed_mask)
+        for column, values in index.columns.items():
+            values = values.astype(np.int64)
+            for orders, old_orders, sign in (
+                (index.ascending_orders, self.ascending_orders, 1),
+                (index.descending_orders, self.descending_orders, -1),
+            ):
+                order = new_ids[old_orders[column]]
+                order = order[order >= 0]
+                order = order[~changed_mask[order]]
+                keys = sign * values[order] * id_range + order
+                new_keys = sign * values[changed_ids] * id_range + changed_ids
+                insert_order = np.argsort(new_keys, kind='stable')
+                positions = np.searchsorted(keys, new_keys[insert_order])
+                orders[column] = np.insert(order, positions, changed_ids[insert_order])
+        index._set_sorted_values()
+        
+        # Evolution graph and name index: shared when no row moved and their
+        # columns are untouched, patched otherwise
+        same_rows = n_kept == self.size == index.size
+        touched = set()
+        for change in changes:
+            touched.update(change['values'] if change['op'] == 'update' else DELTA_COLUMNS)
+        if same_rows and not touched & {'name', 'prev_evolution', 'next_evolution'}:
+            index.evolutions = self.evolutions
+        else:
+            index.evolutions = self.evolutions.updated(self.df, df, keep, changed)
+        if same_rows and 'name' not in touched:
+            index.names = self.names
+        else:
+            index.names = self.names.updated(df['name'].to_numpy(), keep, changed)
+        if same_rows and not touched & set(STAT_COLUMNS) and 'similarity' in self.__dict__:
+            index.similarity = self.similarity
+        return index
+    
+    def stat_bounds(self, column: str) -> Tuple[int, int]:
+        """Return the (min, max) of a stat column."""
+        sorted_values = self.sorted_values[column]
+        if len(sorted_values) == 0:
+            return 0, 0
+        return int(sorted_values[0]), int(sorted_values[-1])
+    
+    def range_mask(self, column: str, low: int, high: int) -> np.ndarray:
+        """
+        Mask the rows with low <= column <= high via binary search.
+        
+        Args:
+            column: Column in SORT_COLUMNS
+            low: Inclusive lower bound
+            high: Inclusive upper bound
+        
+        Returns:
+            np.ndarray: Boolean mask with one entry per row
+        """
+        sorted_values = self.sorted_values[column]
+        start = np.searchsorted(sorted_values, low, side='left')
+        end = np.searchsorted(sorted_values, high, side='right')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.ascending_orders[column][start:end]] = True
+        return mask
+    
+    def mask(self, types: Optional[Sequence[str]] = None, final_only: bool = False,
+             whole_family: bool = False, stage: Optional[int] = None,
+             name: Optional[str] = None,
+             stat_ranges: Optional[Dict[str, Tuple[int, int]]] = None) -> np.ndarray:
+        """
+        Build the boolean row mask for a set of filters.
+        
+        The type and name filters select the matching Pokemon, whole_family
+        then widens that selection to their evolution families, and
+        final_only/stage/stat_ranges narrow the result.
+        
+        Args:
+            types: Keep Pokemon having any of these types (either slot)
+            final_only: Keep only Pokemon with no next evolution
+            whole_family: Include every evolution family member of a match
+            stage: Keep only Pokemon at this evolution stage (1 = base)
+            name: Keep Pokemon whose name matches this partial or misspelled
+                  name
+            stat_ranges: Inclusive (low, high) bounds per column in
+                         SORT_COLUMNS
+        
+        Returns:
+            np.ndarray: Boolean mask with one entry per row
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if types:
+            mask[:] = False
+            for type_name in types:
+                type_mask = self.type_masks.get(type_name)
+                if type_mask is not None:
+                    mask |= type_mask
+        
+        if name:
+            mask &= self.names.scores(name) > 0
+        
+        if whole_family and (types or name):
+            mask = self.evolutions.family_mask(np.flatnonzero(mask))
+        
+        if final_only:
+            mask &= self.final_mask
+        
+        if stage is not None:
+            stage_mask = self.evolutions.stage_masks.get(stage)
+            if stage_mask is None:
+                mask[:] = False
+            else:
+                mask &= stage_mask
+        
+        for column, (low, high) in (stat_ranges or {}).items():
+            mask &= self.range_mask(column, low, high)
+        
+        return mask
+    
+    def query(self, types: Optional[Sequence[str]] = None, final_only: bool = False,
+              whole_family: bool = False, stage: Optional[int] = None,
+              name: Optional[str] = None,
+              stat_ranges: Optional[Dict[str, Tuple[int, int]]] = None,
+              sort_keys: Sequence[Tuple[str, bool]] = ()) -> np.ndarray:
+        """
+        Filter and sort the dataset, returning row ids.
+        
+        A single sort key is answered by slicing its presorted permutation;
+        further keys only sort the filtered rows, with dex order breaking any
+        remaining ties.
+        
+        Args:
+            types: Keep Pokemon having any of these types (either slot)
+            final_only: Keep only Pokemon with no next evolution
+            whole_family: Include every evolution family member of a match
+            stage: Keep only Pokemon at this evolution stage (1 = base)
+            name: Keep Pokemon whose name matches this partial or misspelled
+                  name
+            stat_ranges: Inclusive (low, high) bounds per column in
+                         SORT_COLUMNS
+            sort_keys: (column, ascending) pairs, most significant first; when
+                       empty, results are in dex order (relevance order when
+                       searching by name)
+        
+        Returns:
+            np.ndarray: Row ids of the matching Pokemon in result order
+        """
+        mask = self.mask(types, final_only, whole_family, stage, name, stat_ranges)
+        
+        if not sort_keys:
+            if name:
+                return NameSearchIndex.rank(np.flatnonzero(mask), self.names.scores(name))
+            return np.flatnonzero(mask)
+        
+        column, ascending = sort_keys[0]
+        if ascending:
+            order = self.ascending_orders[column]
+        else:
+            order = self.descending_orders[column]
+        rows = order[mask[order]]
+        
+        if len(sort_keys) > 1:
+            # np.lexsort treats its last key as the most significant
+            keys = [rows]
+            for column, ascending in reversed(sort_keys):
+                values = self.columns[column][rows].astype(np.int32)
+                keys.append(values if ascending else -values)
+            rows = rows[np.lexsort(keys)]
+        return rows
+    
+    def run(self, query: PokemonQuery) -> np.ndarray:
+        """
+        Answer a normalized query through the shared LRU cache.
+        
+        Returns:
+            np.ndarray: Read-only row ids in result order
+        """
+        return self._cached_run(query)
+    
+    def _run(self, query: PokemonQuery) -> np.ndarray:
+        rows = self.query(
+            types=query.types,
+            final_only=query.final_only,
+            whole_family=query.whole_family,
+            stage=query.stage,
+            name=query.name,
+            stat_ranges={column: (low, high) for column, low, high in query.stat_ranges},
+            sort_keys=query.sort_keys,
+        )
+        rows.flags.writeable = False
+        return rows
+    
+    def summarize(self, query: PokemonQuery) -> Dict[str, float]:
+        """
+        Cached count/mean/max/min of total_stats over a query's results.
+        
+        Computed from the total_stats array, never from a materialized frame.
+        
+        Returns:
+            Dict[str, float]: Keys count, mean, max and min; the last three are
+                              None when nothing matches
+        """
+        return self._cached_summary(query)
+    
+    def _summarize(self, query: PokemonQuery) -> Dict[str, float]:
+        rows = self.run(query)
+        if len(rows) == 0:
+            return {'count': 0, 'mean': None, 'max': None, 'min': None}
+        values = self.columns['total_stats'][rows]
+        return {
+            'count': len(rows),
+            'mean': float(values.mean()),
+            'max': int(values.max()),
+            'min': int(values.min()),
+        }
+    
+    def cache_info(self):
+        """Return hit/miss statistics of the query cache."""
+        return self._cached_run.cache_info()
+    
+    def top(self, rows: np.ndarray, n: int, column: str = 'total_stats') -> np.ndarray:
+        """
+        Return the ids of the n highest rows by a column, restricted to rows.
+        """
+        selected = np.zeros(self.size, dtype=bool)
+        selected[rows] = True
+        order = self.descending_orders[column]
+        return order[selected[order]][:n]
+    
+    def display_frame(self, rows: np.ndarray,
+                      columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Materialize the given rows as a display-ready DataFrame.
+        
+        Only the requested rows are taken from the underlying data, so the
+        formatting cost scales with the result size rather than the dataset.
+        
+        Args:
+            rows: Row ids to materialize, in display order
+            columns: Columns to include (defaults to all of DISPLAY_COLUMNS)
+        
+        Returns:
+            pd.DataFrame: Rows with missing values shown as '-' and display
+                          column names
+        """
+        data = {}
+        for column in columns or DISPLAY_COLUMNS:
+            values = self.df[column].iloc[rows]
+            if column in ('type2', 'prev_evolution', 'next_evolution'):
+                values = values.astype(object).fillna('-')
+            data[DISPLAY_COLUMNS[column]] = values.to_numpy()
+        return pd.DataFrame(data)
+
+
+class PokemonDataStore:
+    """
+    Serves the current PokemonIndex, picking up data changes while running.
+    
+    The data version starts as the source CSV's checksum and is chained
+    through each delta file applied on top (see delta_version()), so caches
+    keyed by PokemonIndex.version are invalidated exactly when the data
+    changes. At most once per POLL_INTERVAL, current() checks the source,
+    dex and delta files:
+    
+    - new delta files appended after those already applied are applied to
+      the current index incrementally (PokemonIndex.apply_delta);
+    - a changed source or dex file, or an edited, removed or reordered delta
+      file, triggers a full reload;
+    - otherwise the current index is served as is.
+    
+    Indexes are never modified in place, so callers holding an older index
+    keep a consistent view until their next current() call. Deltas apply
+    in order up to the first one that fails (e.g. a half-written file or a
+    base_version mismatch), including on the first load, so a bad delta
+    never stops the data from being served; the failure is kept in
+    last_error and the delta is retried on every poll. A base that cannot
+    be reloaded leaves the previous index in service.
+    """
+    
+    POLL_INTERVAL = 1.0
+    
+    def __init__(self, source_path: str = SOURCE_PATH, dex_path: str = DEX_PATH,
+                 delta_dir: str = DELTA_DIR):
+        self.source_path = source_path
+        self.dex_path = dex_path
+        self.delta_dir = delta_dir
+        self._lock = threading.Lock()
+        self._index: Optional[PokemonIndex] = None
+        self._base_stamp: Tuple = ()
+        self._delta_stamps: List[Tuple] = []
+        self._next_poll = 0.0
+        self.last_error: Optional[str] = None
+        self.applied_deltas: List[str] = []
+    
+    @property
+    def version(self) -> str:
+        """Version of the index currently served."""
+        return self.current().version
+    
+    def current(self) -> PokemonIndex:
+        """
+        Return the index for the current data, refreshing it if due.
+        
+        Raises:
+            OSError, ValueError: Only if the base data cannot be loaded and
+                                 there is no earlier index to fall back on
+        """
+        return self.poll()[0]
+    
+    def poll(self) -> Tuple[PokemonIndex, str]:
+        """
+        Like current(), but also report what this call did.
+        
+        The outcome belongs to this call alone, so concurrent callers (e.g.
+        app sessions) each see their own.
+        
+        Returns:
+            Tuple[PokemonIndex, str]: The index, and 'hit' if it was served
+                as is, 'delta' if new deltas were applied, 'reload' after a
+                full reload, or 'error' if a delta or reload failed
+        """
+        index = self._index
+        if index is not None and time.monotonic() < self._next_poll:
+            return index, 'hit'
+        with self._lock:
+            if self._index is not None and time.monotonic() < self._next_poll:
+                return self._index, 'hit'
+            try:
+                outcome, error = self._refresh()
+            except (OSError, ValueError) as e:
+                if self._index is None:
+                    raise
+                outcome, error = 'error', str(e)
+            if error:
+                outcome = 'error'
+            self.last_error = error
+            self._next_poll = time.monotonic() + self.POLL_INTERVAL
+            return self._index, outcome
+    
+    @staticmethod
+    def _stamp(path: str) -> Tuple:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return (path, None, None)
+        return (path, stat.st_mtime_ns, stat.st_size)
+    
+    def _refresh(self) -> Tuple[str, Optional[str]]:
+        """
+        Bring the served index up to date with the files.
+        
+        Deltas are applied in order until one fails; the index then covers
+        the deltas before it, and the failed one is retried on the next poll.
+        
+        Returns:
+            Tuple[str, Optional[str]]: 'hit', 'delta' or 'reload', and the
+                error of the first delta that failed, if any
+        """
+        base_stamp = (self._stamp(self.source_path), self._stamp(self.dex_path))
+        delta_stamps = [self._stamp(path) for path in list_deltas(self.delta_dir)]
+        applied = len(self._delta_stamps)
+        
+        if self._index is not None and base_stamp == self._base_stamp \
+                and delta_stamps[:applied] == self._delta_stamps:
+            if len(delta_stamps) == applied:
+                return 'hit', None
+            index = self._index
+            pending = delta_stamps[applied:]
+            outcome = 'delta'
+        else:
+            # The dex may be rebuilt by get_pokemon_data(), so stamp it after
+            df = get_pokemon_data(self.source_path, self.dex_path)
+            base_stamp = (self._stamp(self.source_path), self._stamp(self.dex_path))
+            applied = 0
+            pending = delta_stamps
+            outcome = 'reload'
+        
+        # On a reload, deltas are folded into the frame and indexed once
+        reload = outcome == 'reload'
+        version = df.attrs.get('version', '') if reload else index.version
+        error = None
+        for stamp in pending:
+            try:
+                delta = read_delta(stamp[0])
+                next_version = self._next_version(version, delta)
+                if reload:
+                    df, _, _ = apply_changes(df, delta['changes'])
+                else:
+                    index = index.apply_delta(delta['changes'], next_version)
+            except (OSError, ValueError) as e:
+                error = f"{stamp[0]}: {e}"
+                break
+            version = next_version
+            applied += 1
+        if reload:
+            df.attrs['version'] = version
+            index = PokemonIndex(df)
+        
+        self._index = index
+        self._base_stamp = base_stamp
+        self._delta_stamps = delta_stamps[:applied]
+        self.applied_deltas = [stamp[0] for stamp in self._delta_stamps]
+        return outcome, error
+    
+    @staticmethod
+    def _next_version(version: str, delta: dict) -> str:
+        if delta['base_version'] not in (None, version):
+            raise ValueError(
+                f"Delta expects data version {delta['base_version']}, "
+                f"but the current version is {version}"
+            )
+        return delta_version(version, delta['sha256'])
 
 
 if __name__ == "__main__":
@@ -203,4 +1733,4 @@ if __name__ == "__main__":
     print(f"\nTotal Pokemon: {len(df)}")
     print(f"\nColumns: {list(df.columns)}")
     print(f"\nTotal Stats Range: {df['total_stats'].min()} - {df['total_stats'].max()}")
-    print(f"\nTypes available: {sorted(set(df['type1'].dropna()) | set(df['type2'].dropna()))}")
+    print(f"\nTypes available: {get_type_counts(df).to_dict()}")
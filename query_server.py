@@ -0,0 +1,231 @@
+"""
+Pokemon Query Server
+Headless JSON API over the same filter/sort engine the Streamlit app uses.
+
+Usage:
+    python query_server.py [--host 127.0.0.1] [--port 8000]
+
+Endpoints:
+    GET /pokemon   Filtered, sorted and paginated Pokemon
+    GET /types     Type vocabulary with per-type counts
+
+/pokemon query parameters:
+    name                    Partial or misspelled name
+    type                    Type filter; repeat or comma-separate for several
+    final                   true to keep only final evolutions
+    family                  true to expand matches to their evolution families
+    stage                   Evolution stage (1 = base)
+    min_<stat>, max_<stat>  Inclusive bounds for total_stats or a base stat
+    sort                    Comma-separated columns, '-' prefix for descending,
+                            e.g. sort=-speed,-attack
+    page, per_page          1-based page number and page size
+
+Responses carry an ETag derived from the data version and the normalized
+query, so clients can revalidate with If-None-Match and get a 304. Delta
+files dropped into data/deltas are picked up without a restart; they change
+the data version and so every ETag.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from pokemon_data import (
+    DISPLAY_COLUMNS,
+    SORT_COLUMNS,
+    PokemonDataStore,
+    PokemonIndex,
+    PokemonQuery,
+    parse_query_params,
+)
+
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+
+def parse_query(index: PokemonIndex, params: Dict[str, List[str]]) -> PokemonQuery:
+    """
+    Turn URL query parameters into a normalized PokemonQuery.
+
+    One-sided stat bounds are completed by parse_query_params(), so
+    min_speed=100 and min_speed=100&max_speed=<max> share a cache entry.
+
+    Raises:
+        ValueError: On malformed or unknown parameters
+    """
+    def single(key: str) -> str:
+        return params.get(key, [''])[-1].strip()
+
+    types = [
+        type_name.strip()
+        for value in params.get('type', [])
+        for type_name in value.split(',')
+        if type_name.strip()
+    ]
+
+    stage = single('stage')
+
+    stat_ranges = {}
+    for column in SORT_COLUMNS:
+        low, high = single(f'min_{column}'), single(f'max_{column}')
+        if low or high:
+            stat_ranges[column] = (int(low) if low else None, int(high) if high else None)
+
+    return parse_query_params(
+        index,
+        types=types,
+        final_only=single('final').lower() in TRUE_VALUES,
+        whole_family=single('family').lower() in TRUE_VALUES,
+        stage=int(stage) if stage else None,
+        name=single('name') or None,
+        stat_ranges=stat_ranges,
+        sort=single('sort'),
+    )
+
+
+def parse_page(params: Dict[str, List[str]]) -> Tuple[int, int]:
+    """
+    Read the page number and page size, clamped to valid values.
+
+    Raises:
+        ValueError: If either is not an integer
+    """
+    page = int(params.get('page', ['1'])[-1])
+    per_page = int(params.get('per_page', [str(DEFAULT_PER_PAGE)])[-1])
+    return max(page, 1), min(max(per_page, 1), MAX_PER_PAGE)
+
+
+def records(index: PokemonIndex, rows) -> List[dict]:
+    """Materialize rows as JSON-ready dicts, with None for missing values."""
+    frame = index.df.iloc[rows]
+    columns = {
+        column: [None if pd.isna(value) else value for value in frame[column].tolist()]
+        for column in DISPLAY_COLUMNS
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from the given parts."""
+    digest = hashlib.sha1('|'.join(map(repr, parts)).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class QueryService:
+    """
+    Request handling independent of the HTTP transport.
+
+    Each request is answered from the data store's current PokemonIndex;
+    filter/sort results are served from that index's shared LRU cache, and
+    only the requested page is serialized.
+    """
+
+    def __init__(self, store: PokemonDataStore):
+        self.store = store
+
+    def handle(self, path: str, params: Dict[str, List[str]],
+               if_none_match: str = '') -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one GET request.
+
+        Returns:
+            Tuple[int, Dict[str, str], bytes]: Status code, extra headers and body
+        """
+        # One index per request, so a concurrent data update cannot mix versions
+        index = self.store.current()
+        try:
+            if path == '/pokemon':
+                query = parse_query(index, params)
+                page, per_page = parse_page(params)
+                etag = make_etag(index.version, query, page, per_page)
+                if etag in if_none_match:
+                    return 304, {'ETag': etag}, b''
+                return 200, {'ETag': etag}, self._encode(self.pokemon(index, query, page, per_page))
+
+            if path == '/types':
+                etag = make_etag(index.version, 'types')
+                if etag in if_none_match:
+                    return 304, {'ETag': etag}, b''
+                types = {type_name: int(count) for type_name, count in index.type_counts.items()}
+                return 200, {'ETag': etag}, self._encode({'types': types})
+        except ValueError as e:
+            return 400, {}, self._encode({'error': str(e)})
+
+        return 404, {}, self._encode({'error': f"Unknown path: {path}"})
+
+    def pokemon(self, index: PokemonIndex, query: PokemonQuery,
+                page: int, per_page: int) -> dict:
+        """Build the /pokemon response body for one page of a query."""
+        rows = index.run(query)
+        start = (page - 1) * per_page
+        return {
+            'query': query.to_dict(),
+            'total': len(rows),
+            'page': page,
+            'per_page': per_page,
+            'pages': math.ceil(len(rows) / per_page),
+            'results': records(index, rows[start:start + per_page]),
+        }
+
+    @staticmethod
+    def _encode(body: dict) -> bytes:
+        return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """HTTP adapter that forwards GET requests to the server's QueryService."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, headers, body = self.server.service.handle(
+            url.path.rstrip('/') or '/',
+            parse_qs(url.query),
+            self.headers.get('If-None-Match', '')
+        )
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Cache-Control', 'no-cache')
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+def make_server(host: str, port: int, store: PokemonDataStore) -> ThreadingHTTPServer:
+    """Create a threaded HTTP server sharing one data store."""
+    server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+    server.service = QueryService(store)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Pokemon queries as JSON")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args()
+
+    store = PokemonDataStore()
+    index = store.current()
+    server = make_server(args.host, args.port, store)
+    print(f"Serving {index.size} Pokemon on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
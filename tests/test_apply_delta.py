@@ -0,0 +1,122 @@
+"""
+PokemonIndex.apply_delta must build the same index as a full rebuild.
+
+Random deltas of adds, stat updates, evolution relinks, renames and removals
+are applied incrementally and compared against PokemonIndex built from
+apply_changes() on the same frame.
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pokemon_data import (POKEMON_TYPES, SORT_COLUMNS, SOURCE_PATH, STAT_COLUMNS,
+                          PokemonIndex, apply_changes, get_pokemon_data)
+
+
+TRIALS = 15
+
+
+@pytest.fixture(scope='module')
+def base(tmp_path_factory):
+    dex_path = tmp_path_factory.mktemp('dex') / 'pokemon.dex'
+    return PokemonIndex(get_pokemon_data(SOURCE_PATH, str(dex_path)))
+
+
+def random_changes(rng, names, trial):
+    changes = []
+    names = list(names)
+    for _ in range(rng.randint(0, 25)):
+        op = rng.choice(['add', 'update', 'update', 'remove'])
+        if op == 'add':
+            n = len(changes)
+            name = rng.choice([f'Newmon{trial}_{n}', f'Mr. Mon{trial}{n}', f'newmon{trial}_{n}!'])
+            row = {
+                'name': name,
+                'type1': rng.choice(POKEMON_TYPES),
+                'type2': rng.choice(POKEMON_TYPES + [None]),
+                'prev_evolution': rng.choice(names + [None, None, 'Ghostmon']),
+                'next_evolution': rng.choice(names + [None] * 3),
+            }
+            row.update({column: rng.randint(1, 255) for column in STAT_COLUMNS})
+            changes.append({'op': 'add', 'row': row})
+            names.append(name)
+        elif op == 'update':
+            name = rng.choice(names)
+            values = {column: rng.randint(1, 255) for column in rng.sample(STAT_COLUMNS, 2)}
+            r = rng.random()
+            if r < 0.15:
+                values['prev_evolution'] = rng.choice(names + [None])
+            elif r < 0.3:
+                values['next_evolution'] = rng.choice(names + [None])
+            elif r < 0.4:
+                values['name'] = name + 'X'
+                names.remove(name)
+                names.append(name + 'X')
+            changes.append({'op': 'update', 'name': name, 'values': values})
+        else:
+            name = rng.choice(names)
+            names.remove(name)
+            changes.append({'op': 'remove', 'name': name})
+    return changes
+
+
+def assert_same_evolutions(a, b):
+    assert a.size == b.size
+    np.testing.assert_array_equal(a.parent, b.parent)
+    np.testing.assert_array_equal(a.stage, b.stage)
+    assert a.stages == b.stages
+    for stage in a.stages:
+        np.testing.assert_array_equal(a.stage_masks[stage], b.stage_masks[stage])
+    for x, y in zip(a.children, b.children):
+        np.testing.assert_array_equal(x, y)
+    assert sorted(map(tuple, a.family_members)) == sorted(map(tuple, b.family_members))
+    assert all(members.dtype == np.int32 for members in a.family_members)
+    for i in range(a.size):
+        np.testing.assert_array_equal(a.family(i), b.family(i))
+
+
+def assert_same_names(a, b):
+    assert a.size == b.size
+    assert list(a.sorted_keys) == list(b.sorted_keys)
+    np.testing.assert_array_equal(a.sorted_ids, b.sorted_ids)
+    assert a.sorted_ids.dtype == b.sorted_ids.dtype
+    np.testing.assert_array_equal(a.keys, b.keys)
+    np.testing.assert_array_equal(a.trigram_counts, b.trigram_counts)
+    assert a.postings.keys() == b.postings.keys()
+    for trigram, rows in a.postings.items():
+        np.testing.assert_array_equal(rows, b.postings[trigram])
+        assert rows.dtype == np.int32
+
+
+def assert_same_index(a, b):
+    pd.testing.assert_frame_equal(a.df, b.df)
+    assert a.version == b.version
+    assert list(a.type_counts.items()) == list(b.type_counts.items())
+    assert a.types == b.types
+    for t in b.type_masks:
+        np.testing.assert_array_equal(a.type_masks[t], b.type_masks[t])
+        np.testing.assert_array_equal(a.type_rows[t], b.type_rows[t])
+    np.testing.assert_array_equal(a.final_mask, b.final_mask)
+    for column in SORT_COLUMNS:
+        np.testing.assert_array_equal(a.ascending_orders[column], b.ascending_orders[column])
+        np.testing.assert_array_equal(a.descending_orders[column], b.descending_orders[column])
+        np.testing.assert_array_equal(a.sorted_values[column], b.sorted_values[column])
+    assert_same_evolutions(a.evolutions, b.evolutions)
+    assert_same_names(a.names, b.names)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_apply_delta_matches_full_rebuild(base, seed):
+    rng = random.Random(seed)
+    index = base
+    for trial in range(TRIALS):
+        changes = random_changes(rng, index.df['name'].tolist(), trial)
+        version = f'{seed}-{trial}'
+        updated = index.apply_delta(changes, version)
+        df, _, _ = apply_changes(index.df, changes)
+        df.attrs['version'] = version
+        assert_same_index(updated, PokemonIndex(df))
+        index = updated
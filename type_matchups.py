@@ -0,0 +1,185 @@
+"""
+Pokemon Type Matchups Module
+Type effectiveness chart and vectorized team coverage analysis.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from pokemon_data import POKEMON_TYPES
+
+
+# Generation 6+ effectiveness, attacking type -> {multiplier: defending types}.
+# Pairs not listed are neutral (1x).
+_EFFECTIVENESS: Dict[str, Dict[float, List[str]]] = {
+    'Normal': {0.5: ['Rock', 'Steel'], 0.0: ['Ghost']},
+    'Fire': {2.0: ['Grass', 'Ice', 'Bug', 'Steel'], 0.5: ['Fire', 'Water', 'Rock', 'Dragon']},
+    'Water': {2.0: ['Fire', 'Ground', 'Rock'], 0.5: ['Water', 'Grass', 'Dragon']},
+    'Electric': {2.0: ['Water', 'Flying'], 0.5: ['Electric', 'Grass', 'Dragon'], 0.0: ['Ground']},
+    'Grass': {
+        2.0: ['Water', 'Ground', 'Rock'],
+        0.5: ['Fire', 'Grass', 'Poison', 'Flying', 'Bug', 'Dragon', 'Steel'],
+    },
+    'Ice': {2.0: ['Grass', 'Ground', 'Flying', 'Dragon'], 0.5: ['Fire', 'Water', 'Ice', 'Steel']},
+    'Fighting': {
+        2.0: ['Normal', 'Ice', 'Rock', 'Dark', 'Steel'],
+        0.5: ['Poison', 'Flying', 'Psychic', 'Bug', 'Fairy'],
+        0.0: ['Ghost'],
+    },
+    'Poison': {2.0: ['Grass', 'Fairy'], 0.5: ['Poison', 'Ground', 'Rock', 'Ghost'], 0.0: ['Steel']},
+    'Ground': {
+        2.0: ['Fire', 'Electric', 'Poison', 'Rock', 'Steel'],
+        0.5: ['Grass', 'Bug'],
+        0.0: ['Flying'],
+    },
+    'Flying': {2.0: ['Grass', 'Fighting', 'Bug'], 0.5: ['Electric', 'Rock', 'Steel']},
+    'Psychic': {2.0: ['Fighting', 'Poison'], 0.5: ['Psychic', 'Steel'], 0.0: ['Dark']},
+    'Bug': {
+        2.0: ['Grass', 'Psychic', 'Dark'],
+        0.5: ['Fire', 'Fighting', 'Poison', 'Flying', 'Ghost', 'Steel', 'Fairy'],
+    },
+    'Rock': {2.0: ['Fire', 'Ice', 'Flying', 'Bug'], 0.5: ['Fighting', 'Ground', 'Steel']},
+    'Ghost': {2.0: ['Psychic', 'Ghost'], 0.5: ['Dark'], 0.0: ['Normal']},
+    'Dragon': {2.0: ['Dragon'], 0.5: ['Steel'], 0.0: ['Fairy']},
+    'Dark': {2.0: ['Psychic', 'Ghost'], 0.5: ['Fighting', 'Dark', 'Fairy']},
+    'Steel': {2.0: ['Ice', 'Rock', 'Fairy'], 0.5: ['Fire', 'Water', 'Electric', 'Steel']},
+    'Fairy': {2.0: ['Fighting', 'Dragon', 'Dark'], 0.5: ['Fire', 'Poison', 'Steel']},
+}
+
+
+def build_type_chart() -> np.ndarray:
+    """
+    Build the 18x18 type effectiveness matrix.
+
+    Returns:
+        np.ndarray: float32 matrix indexed [attacking type, defending type] in
+                    POKEMON_TYPES order
+    """
+    position = {type_name: i for i, type_name in enumerate(POKEMON_TYPES)}
+    chart = np.ones((len(POKEMON_TYPES), len(POKEMON_TYPES)), dtype=np.float32)
+    for attacker, multipliers in _EFFECTIVENESS.items():
+        for multiplier, defenders in multipliers.items():
+            for defender in defenders:
+                chart[position[attacker], position[defender]] = multiplier
+    return chart
+
+
+TYPE_CHART = build_type_chart()
+
+
+def defensive_multipliers(df: pd.DataFrame) -> np.ndarray:
+    """
+    Damage multiplier of every attacking type against every species.
+
+    Computed in one gather over the type chart: the chart gets an extra
+    all-ones column for "no second type", so a missing type2 (code -1) picks
+    that column and needs no special casing.
+
+    Args:
+        df: DataFrame as returned by get_pokemon_data()
+
+    Returns:
+        np.ndarray: float32 matrix of shape (len(df), 18), indexed
+                    [species, attacking type]
+    """
+    padded = np.hstack([TYPE_CHART, np.ones((len(POKEMON_TYPES), 1), dtype=np.float32)])
+    codes1 = df['type1'].cat.codes.to_numpy()
+    codes2 = df['type2'].cat.codes.to_numpy()
+    return (padded[:, codes1] * padded[:, codes2]).T
+
+
+class TypeMatchups:
+    """
+    Precomputed matchup matrices for team analysis.
+
+    Holds each species' defensive multipliers and the defending types its
+    STAB (same-type) attacks hit super-effectively. Team reports and
+    candidate rankings are then sums and ORs over rows of these matrices.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.defense = defensive_multipliers(df)
+        self.weak = self.defense > 1
+        self.resist = self.defense < 1
+        self.immune = self.defense == 0
+
+        # Attacking types per species as a one-hot matrix, then the defending
+        # types those attacks hit for 2x or more
+        n_types = len(POKEMON_TYPES)
+        stab = np.zeros((len(df), n_types + 1), dtype=np.float32)
+        rows = np.arange(len(df))
+        stab[rows, df['type1'].cat.codes.to_numpy()] = 1
+        stab[rows, df['type2'].cat.codes.to_numpy()] = 1
+        self.stab = stab[:, :n_types]
+        self.coverage = (self.stab @ (TYPE_CHART > 1).astype(np.float32)) > 0
+
+        self.total_stats = df['total_stats'].to_numpy()
+
+    def team_report(self, team: Sequence[int]) -> pd.DataFrame:
+        """
+        Summarize a team's weaknesses, resistances and coverage.
+
+        Args:
+            team: Species ids of the team members
+
+        Returns:
+            pd.DataFrame: One row per type with the number of members weak to,
+                          resisting and immune to attacks of that type, whether
+                          more members are weak than resist it, and whether any
+                          member's STAB hits that type super-effectively
+        """
+        team = np.asarray(team, dtype=np.intp)
+        weak = self.weak[team].sum(axis=0)
+        resist = self.resist[team].sum(axis=0)
+        return pd.DataFrame({
+            'type': POKEMON_TYPES,
+            'weak': weak,
+            'resist': resist,
+            'immune': self.immune[team].sum(axis=0),
+            'exposed': weak > resist,
+            'covered': self.coverage[team].any(axis=0),
+        })
+
+    def rank_candidates(self, team: Sequence[int],
+                        candidates: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Score every candidate as the next team member, best first.
+
+        Every candidate is scored in one pass: adding its row to the team's
+        weakness/resistance counts and OR-ing its coverage into the team's
+        gives the team totals with that candidate included.
+
+        Args:
+            team: Species ids of the current team members
+            candidates: Boolean mask of species to consider (defaults to all);
+                        team members are always excluded
+
+        Returns:
+            pd.DataFrame: Columns species_id, coverage_gaps (types no STAB
+                          hits super-effectively), exposed_types (types more
+                          members are weak than resistant to) and total_stats,
+                          sorted by gaps, then exposure, then total stats
+        """
+        team = np.asarray(team, dtype=np.intp)
+        if candidates is None:
+            candidates = np.ones(len(self.df), dtype=bool)
+        candidates = candidates.copy()
+        candidates[team] = False
+        ids = np.flatnonzero(candidates)
+
+        weak = self.weak[team].sum(axis=0) + self.weak[ids]
+        resist = self.resist[team].sum(axis=0) + self.resist[ids]
+        covered = self.coverage[team].any(axis=0) | self.coverage[ids]
+
+        gaps = (~covered).sum(axis=1)
+        exposed = (weak > resist).sum(axis=1)
+        total_stats = self.total_stats[ids]
+        order = np.lexsort((-total_stats, exposed, gaps))
+        return pd.DataFrame({
+            'species_id': ids[order],
+            'coverage_gaps': gaps[order],
+            'exposed_types': exposed[order],
+            'total_stats': total_stats[order],
+        })